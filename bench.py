@@ -0,0 +1,290 @@
+"""
+Benchmarks for the hot paths of the game.
+
+    python bench.py [-o results.json] [--baseline old.json] [--threshold 0.1]
+
+Every benchmark is timed with timeit and the per-call times are written as
+JSON. When a baseline file is given the results are compared against it and
+the exit status is 1 if anything got slower by more than the threshold.
+
+The ui benchmarks need a display (run under xvfb-run on a headless box),
+they are skipped when Tk can't open one.
+"""
+
+from contextlib import redirect_stdout
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+import deck
+import scoring
+import words
+
+BENCHMARKS = {}
+
+
+def benchmark(name, ui=False, repeat=5):
+    """
+    register a benchmark, the function does the setup and returns the
+    callable to time
+    """
+
+    def register(func):
+        BENCHMARKS[name] = (func, ui, repeat)
+        return func
+
+    return register
+
+
+@benchmark("score")
+def bench_score():
+    pairs = list(zip(words.load_all_words()[:1000], words.load_answers()[:1000]))
+    return lambda: [scoring.score(guess, answer) for guess, answer in pairs], len(pairs)
+
+
+@benchmark("score_batch")
+def bench_score_batch():
+    answers = words.load_answers().array()
+    return lambda: scoring.score_batch("CRANE", answers), 1
+
+
+@benchmark("all_words_contains")
+def bench_all_words_contains():
+    all_words = words.load_all_words()
+    guesses = ["CRANE", "ZZZZZ", "ABACK", "ZONAL", "QUEUE"] * 200
+    return lambda: [guess in all_words for guess in guesses], len(guesses)
+
+
+@benchmark("deck_draw")
+def bench_deck_draw():
+    answer_deck = deck.AnswerDeck(words.load_answers(), seed=0)
+    return answer_deck.draw, 1
+
+
+@benchmark("wordlist_load")
+def bench_wordlist_load():
+    def load():
+        answers = words.open_packed(
+            words.shard_path("answers", 5), *words.shard_sources("answers", 5)
+        )
+        all_words = words.open_packed(
+            words.shard_path("all-words", 5), *words.shard_sources("all-words", 5)
+        )
+        return answers[0], "CRANE" in all_words
+
+    return load, 1
+
+
+@benchmark("import_wordle", repeat=3)
+def bench_import_wordle():
+    cmd = [sys.executable, "-c", "import wordle"]
+    return lambda: subprocess.run(cmd, check=True), 1
+
+
+def _main_screen(boards=1):
+    import wordle
+
+    app = wordle.WordleApp(
+        answer_deck=deck.AnswerDeck(wordle.ANSWERS, seed=0), boards=boards
+    )
+    app.withdraw()
+    app.update()
+    return app, app.frames["MainScreen"]
+
+
+@benchmark("new_game", ui=True)
+def bench_new_game():
+    app, screen = _main_screen()
+
+    def new_game():
+        screen.new_game()
+        app.update_idletasks()
+
+    new_game.renderer = screen.renderer
+    return new_game, 1
+
+
+@benchmark("check_word", ui=True)
+def bench_check_word():
+    app, screen = _main_screen()
+
+    def check_word():
+        screen.new_game()
+        screen.words[0] = "CRANE"
+        screen.check_word()
+        app.update_idletasks()
+
+    check_word.renderer = screen.renderer
+    return check_word, 1
+
+
+@benchmark("check_word_16_boards", ui=True)
+def bench_check_word_16_boards():
+    app, screen = _main_screen(boards=16)
+
+    def check_word():
+        screen.new_game()
+        screen.words[0] = "CRANE"
+        screen.check_word()
+        app.update_idletasks()
+
+    check_word.renderer = screen.renderer
+    return check_word, 1
+
+
+@benchmark("update_labels", ui=True)
+def bench_update_labels():
+    app, screen = _main_screen()
+    screen.words[0] = "CRA"
+
+    def update_labels():
+        screen.update_labels()
+        app.update_idletasks()
+
+    update_labels.renderer = screen.renderer
+    return update_labels, 1
+
+
+@benchmark("update_keyboard", ui=True)
+def bench_update_keyboard():
+    app, screen = _main_screen()
+    screen.correct_letters = set("CRA")
+    screen.incorrect_letters = set("NE")
+
+    def update_keyboard():
+        screen.update_keyboard()
+        app.update_idletasks()
+
+    update_keyboard.renderer = screen.renderer
+    return update_keyboard, 1
+
+
+def _construct_main_screen(canvas_ui):
+    import wordle
+
+    app = wordle.WordleApp(
+        answer_deck=deck.AnswerDeck(wordle.ANSWERS, seed=0), canvas_ui=canvas_ui
+    )
+    app.withdraw()
+
+    def construct():
+        screen = wordle.MainScreen(master=app, controller=app, bg=wordle.COLOR_BLANK)
+        app.update_idletasks()
+        construct.widgets = count_widgets(screen)
+        screen.destroy()
+
+    return construct, 1
+
+
+@benchmark("construct_widget_board", ui=True)
+def bench_construct_widget_board():
+    return _construct_main_screen(canvas_ui=False)
+
+
+@benchmark("construct_canvas_board", ui=True)
+def bench_construct_canvas_board():
+    return _construct_main_screen(canvas_ui=True)
+
+
+def count_widgets(widget):
+    """number of widgets in a widget tree, the widget itself included"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def has_display():
+    import tkinter as tk
+
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return False
+    return True
+
+
+def run(selected=None):
+    """run the benchmarks and return {name: stats} with times in microseconds"""
+    results = {}
+    display = None
+    for name, (setup, ui, repeat) in BENCHMARKS.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        if ui:
+            display = has_display() if display is None else display
+            if not display:
+                print(f"{name:<20} skipped, no display", file=sys.stderr)
+                continue
+
+        with redirect_stdout(io.StringIO()):
+            func, per_call = setup()
+            timer = timeit.Timer(func)
+            number, _ = timer.autorange()
+            renderer = getattr(func, "renderer", None)
+            calls = sum(renderer.calls.values()) if renderer else 0
+            times = timer.repeat(repeat=repeat, number=number)
+
+        per_op = [t / number / per_call * 1e6 for t in times]
+        results[name] = {
+            "min_us": min(per_op),
+            "median_us": statistics.median(per_op),
+            "number": number,
+            "repeat": repeat,
+        }
+        if renderer:
+            calls = sum(renderer.calls.values()) - calls
+            results[name]["tk_calls"] = calls / (repeat * number * per_call)
+        if hasattr(func, "widgets"):
+            results[name]["widgets"] = func.widgets
+        print(f"{name:<20} {min(per_op):>12.3f} us", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """the benchmarks slower than the baseline by more than threshold"""
+    regressions = []
+    for name, stats in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        ratio = stats["min_us"] / old["min_us"]
+        change = f"{100 * (ratio - 1):+.1f}%"
+        print(f"{name:<20} {old['min_us']:>12.3f} -> {stats['min_us']:.3f} us {change}")
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the hot paths")
+    parser.add_argument("names", nargs="*", help="only run benchmarks matching these")
+    parser.add_argument("-o", "--output", default="bench-results.json")
+    parser.add_argument("--baseline", help="results of an earlier run to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed slowdown before a benchmark counts as a regression",
+    )
+    args = parser.parse_args()
+
+    report = {
+        "version": 1,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run(args.names),
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report["results"], baseline, args.threshold)
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}")
+            sys.exit(1)
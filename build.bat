@@ -1,7 +1,8 @@
 @REM @ECHO OFF
+python words.py
 pyinstaller --clean -y --onefile --windowed --log-level INFO ^
             --add-data "assets/*.png;assets" ^
-            --add-data "wordlists/*.txt;wordlists" ^
+            --add-data "wordlists/*.bin;wordlists" ^
             --icon "assets/wordle_logo_32x32.ico" ^
             wordle.py
             @REM --splash "assets/wordle_logo_32x32.png" ^
@@ -0,0 +1,197 @@
+"""
+Constraint index for filtering a wordlist by the feedback of a game.
+
+Sets of words are stored as python ints used as bitsets, bit i standing for
+the i-th word of the list. The index keeps one bitset per (position, letter)
+and one per (letter, minimum count), so narrowing a wordlist down to the
+words consistent with some feedback is a handful of ANDs, no matter how long
+the list is.
+"""
+
+from functools import lru_cache
+from itertools import compress
+
+import scoring
+import words
+
+
+class ConstraintIndex:
+    """bitset index over a wordlist of equal length words"""
+
+    def __init__(self, words):
+        # decoded once, picking words out of a packed list one at a time is slow
+        self.words = words = list(words)
+        self.word_len = len(words[0]) if len(words) else 0
+        self.all = (1 << len(words)) - 1
+
+        positions = [{} for _ in range(self.word_len)]
+        counts = {}
+        for i, word in enumerate(words):
+            for p, c in enumerate(word):
+                positions[p].setdefault(c, []).append(i)
+            for c in set(word):
+                n = word.count(c)
+                per_letter = counts.setdefault(c, [])
+                while len(per_letter) < n:
+                    per_letter.append([])
+                for k in range(n):
+                    per_letter[k].append(i)
+
+        n = len(words)
+        # position[p][c]: words with c at position p
+        self.position = [
+            {c: _bitset(ids, n) for c, ids in letters.items()} for letters in positions
+        ]
+        # at_least[c][k]: words with at least k + 1 copies of c
+        self.at_least = {c: [_bitset(ids, n) for ids in ks] for c, ks in counts.items()}
+
+    def has_letter(self, letter, position):
+        return self.position[position].get(letter, 0)
+
+    def with_count(self, letter, count):
+        """words with at least count copies of letter"""
+        if count <= 0:
+            return self.all
+        per_letter = self.at_least.get(letter, ())
+        return per_letter[count - 1] if count <= len(per_letter) else 0
+
+    def filter(self, guess, pattern, bits=None):
+        """narrow bits down to the words that would give pattern for guess"""
+        bits = self.all if bits is None else bits
+        digits = scoring.decode(pattern, self.word_len)
+
+        found = {}
+        capped = set()
+        for p, (c, digit) in enumerate(zip(guess, digits)):
+            if digit == scoring.CORRECT:
+                bits &= self.has_letter(c, p)
+            else:
+                bits &= ~self.has_letter(c, p)
+            if digit == scoring.ABSENT:
+                capped.add(c)
+            else:
+                found[c] = found.get(c, 0) + 1
+
+        for c in set(guess):
+            n = found.get(c, 0)
+            bits &= self.with_count(c, n)
+            if c in capped:
+                # a grey copy means the word has exactly as many as we found
+                bits &= ~self.with_count(c, n + 1)
+        return bits
+
+    def candidates(self, history):
+        """bitset of the words consistent with a list of (guess, pattern)"""
+        bits = self.all
+        for guess, pattern in history:
+            bits = self.filter(guess, pattern, bits)
+        return bits
+
+    def indices(self, bits):
+        """indices of the words in bits, in wordlist order"""
+        out = []
+        if bits.bit_count() * 4 > bits.bit_length():
+            # dense, walk the set bits of each byte from a table
+            data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+            for i, byte in enumerate(data):
+                if byte:
+                    base = i << 3
+                    out.extend([base + b for b in _BYTE_BITS[byte]])
+        else:
+            flags = bin(bits)[:1:-1]
+            i = flags.find("1")
+            while i >= 0:
+                out.append(i)
+                i = flags.find("1", i + 1)
+        return out
+
+    def select(self, bits):
+        """the words in bits"""
+        # one flag byte per word, lowest bit first, for compress to pick with
+        flags = bin(bits)[:1:-1].encode("ascii").translate(_FLAGS)
+        return list(compress(self.words, flags))
+
+
+def count(bits):
+    """number of words in a bitset"""
+    return bits.bit_count()
+
+
+@lru_cache(maxsize=words.SHARDS_CACHED)
+def load_index(words):
+    """build, or reuse, the index for a wordlist"""
+    return ConstraintIndex(words)
+
+
+# ascii "0" and "1" to the bytes 0 and 1
+_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+# positions of the set bits of every byte value
+_BYTE_BITS = [tuple(b for b in range(8) if value >> b & 1) for value in range(256)]
+
+
+def _bitset(ids, n):
+    buf = bytearray((n + 7) // 8)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+class HardMode:
+    """
+    the hints revealed so far, which every later guess has to use: greens
+    stay where they are and yellows appear somewhere in the word
+    """
+
+    def __init__(self, words, history=()):
+        self.words = words
+        self.word_len = len(words[0]) if len(words) else 0
+        # position -> letter it has to be
+        self.greens = {}
+        # letter -> copies the word needs at least
+        self.counts = {}
+        for guess, pattern in history:
+            self.add(guess, pattern)
+
+    def add(self, guess, pattern):
+        """take in the hints of a guess"""
+        found = {}
+        for p, (c, digit) in enumerate(
+            zip(guess, scoring.decode(pattern, self.word_len))
+        ):
+            if digit == scoring.CORRECT:
+                self.greens[p] = c
+            if digit != scoring.ABSENT:
+                found[c] = found.get(c, 0) + 1
+        for c, n in found.items():
+            if n > self.counts.get(c, 0):
+                self.counts[c] = n
+
+    def violation(self, word):
+        """why word doesn't use the hints, None if it does"""
+        for p, c in sorted(self.greens.items()):
+            if word[p] != c:
+                return f"{_ordinal(p + 1)} letter must be {c}"
+        for c, n in self.counts.items():
+            if word.count(c) < n:
+                return f"Guess must contain {c}" + (f" {n} times" if n > 1 else "")
+        return None
+
+    def bits(self):
+        """bitset of the words that use every hint"""
+        index = load_index(self.words)
+        bits = index.all
+        for p, c in self.greens.items():
+            bits &= index.has_letter(c, p)
+        for c, n in self.counts.items():
+            bits &= index.with_count(c, n)
+        return bits
+
+    def allowed(self):
+        """every guess that may still be played"""
+        return load_index(self.words).select(self.bits())
+
+
+def _ordinal(n):
+    if n % 100 in (11, 12, 13):
+        return f"{n}th"
+    return f"{n}{ {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
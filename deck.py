@@ -0,0 +1,139 @@
+"""
+Answer scheduling, so the same answer does not come up twice until every
+other answer has been played.
+
+The deck is a seeded shuffle of the answer list plus a cursor. Only the seed,
+the round and the cursor are saved, the permutation itself is rebuilt from
+the seed, so the state file stays a few bytes no matter how big the list is.
+"""
+
+from datetime import date
+
+import json
+import os
+import random
+import zlib
+
+import words
+
+STATE_VERSION = 1
+
+# day zero of the daily answers
+DAILY_EPOCH = date(2021, 6, 19)
+
+
+class AnswerDeck:
+    """a shuffled deck of answers, drawn from without repeats"""
+
+    def __init__(self, answers, seed=None, state_path=None):
+        self.answers = answers
+        self.state_path = state_path
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.round = 0
+        self.cursor = 0
+        self._order = None
+        # only a saved deck needs to notice that the answers changed
+        if state_path is not None:
+            self._fingerprint = fingerprint(answers)
+            self.load()
+
+    def draw(self):
+        """the next answer, reshuffling once the deck runs out"""
+        if self.cursor >= len(self.answers):
+            self.round += 1
+            self.cursor = 0
+            self._order = None
+        if self._order is None:
+            self._order = self._shuffle()
+
+        answer = self.answers[self._order[self.cursor]]
+        self.cursor += 1
+        if self.state_path is not None:
+            self.save()
+        return answer
+
+    def remaining(self):
+        """answers left before the deck is reshuffled"""
+        return len(self.answers) - self.cursor
+
+    def _shuffle(self):
+        order = list(range(len(self.answers)))
+        random.Random(f"{self.seed}:{self.round}").shuffle(order)
+        return order
+
+    def load(self):
+        """pick up where the saved deck left off, if it matches our answers"""
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            state.get("version") != STATE_VERSION
+            or state.get("answers") != self._fingerprint
+        ):
+            return
+        self.seed = state["seed"]
+        self.round = state["round"]
+        self.cursor = state["cursor"]
+
+    def save(self):
+        """atomically write the deck state"""
+        state = {
+            "version": STATE_VERSION,
+            "answers": self._fingerprint,
+            "seed": self.seed,
+            "round": self.round,
+            "cursor": self.cursor,
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.state_path)
+
+
+class DailyDeck:
+    """everyone gets the same answer on the same day"""
+
+    def __init__(self, answers, today=None):
+        self.answers = answers
+        self.today = today
+        self._order = AnswerDeck(answers, seed="daily")._shuffle()
+
+    def draw(self):
+        today = self.today or date.today()
+        day = (today - DAILY_EPOCH).days
+        return self.answers[self._order[day % len(self.answers)]]
+
+
+def fingerprint(answers):
+    """
+    a short checksum of the words of a wordlist, to notice when they change.
+    a packed wordlist is checked straight off its mapped words, a few KB
+    """
+    if isinstance(answers, (words.PackedWordlist, words.LazyWordlist)):
+        return zlib.crc32(answers.buffer)
+    return zlib.crc32("\n".join(answers).encode())
+
+
+def open_deck(answers, seed=None, daily=False, wordlist=None):
+    """
+    the deck the game draws from: a reproducible in-memory deck when a seed
+    is given, the daily answer when daily is set, otherwise a deck that is
+    saved between runs
+    """
+    if daily:
+        return DailyDeck(answers)
+    if seed is not None:
+        return AnswerDeck(answers, seed=seed)
+    return AnswerDeck(answers, state_path=state_path(len(answers[0]), wordlist))
+
+
+def state_path(length, wordlist=None):
+    """where the deck for a word length of a wordlist is saved"""
+    if wordlist is not None:
+        return words.DATA_DIR / f"deck-{wordlist}-{length}.json"
+    return words.DATA_DIR / f"deck-{length}.json"
@@ -0,0 +1,150 @@
+"""
+Structured event log of what happens in a game.
+
+    python events.py [-n 20] [--games]
+
+Events are logging records carrying a dict of fields. Emitting one from
+the ui only appends it to an in-memory ring buffer and puts it on a queue,
+a background listener thread writes it as a JSON line to a rotating file,
+so a slow disk or a missing console never holds up a key press.
+
+Key presses are logged at DEBUG and left out unless asked for, games,
+guesses and results at INFO. Every game starts with its answer and every
+guess is logged with its feedback, so the log is enough to replay games.
+"""
+
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+import argparse
+import json
+import logging
+import queue
+
+import words
+
+LOG_NAME = "events.log"
+# rotate at this size, keeping this many old files around
+MAX_BYTES = 1 << 20
+BACKUP_COUNT = 3
+# events kept in memory
+CAPACITY = 1000
+
+
+class RingBuffer(logging.Handler):
+    """keeps the most recent events in memory"""
+
+    def __init__(self, capacity=CAPACITY):
+        super().__init__()
+        self.events = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.events.append(as_dict(record))
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(as_dict(record), separators=(",", ":"))
+
+
+class EventLog:
+    """logs game events to a ring buffer and, off the ui thread, to a file"""
+
+    def __init__(self, path=None, level=logging.INFO, capacity=CAPACITY):
+        self.path = words.DATA_DIR / LOG_NAME if path is None else path
+        # not registered with logging, events stay out of the root logger
+        self.logger = logging.Logger("pywordle.events", level)
+
+        self.buffer = RingBuffer(capacity)
+        self.logger.addHandler(self.buffer)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = RotatingFileHandler(
+            self.path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, delay=True
+        )
+        self.file.setFormatter(JSONFormatter())
+        records = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(records))
+        self.listener = QueueListener(records, self.file)
+        self.listener.start()
+
+    def event(self, name, level=logging.INFO, **fields):
+        """log an event with some fields"""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, name, extra={"fields": fields})
+
+    def key(self, name, **fields):
+        """log a key press, only kept when keystroke logging is on"""
+        self.event(name, logging.DEBUG, **fields)
+
+    def recent(self):
+        """the events still in memory, oldest first"""
+        return list(self.buffer.events)
+
+    def close(self):
+        """write out the queued events and stop the writer thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+            self.file.close()
+
+
+def as_dict(record):
+    return {
+        "time": round(record.created, 3),
+        "level": record.levelname,
+        "event": record.msg,
+        **getattr(record, "fields", {}),
+    }
+
+
+def read_events(path=None):
+    """every logged event, oldest first, across the rotated files"""
+    path = words.DATA_DIR / LOG_NAME if path is None else path
+    for n in range(BACKUP_COUNT, -1, -1):
+        part = path.with_name(f"{path.name}.{n}") if n else path
+        try:
+            f = open(part)
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def replay(events):
+    """rebuild the games in a stream of events, yields (answer, guesses)"""
+    answer, guesses = None, []
+    for event in events:
+        if event["event"] == "new_game":
+            if answer is not None:
+                yield answer, guesses
+            # multi board games have answers instead, they aren't replayed
+            answer, guesses = event.get("answer"), []
+        elif event["event"] == "resume_game":
+            if answer is not None:
+                yield answer, guesses
+            answer, guesses = event["answer"], [tuple(g) for g in event["guesses"]]
+        elif event["event"] == "guess" and answer is not None:
+            guesses.append((event["word"], event["pattern"]))
+    if answer is not None:
+        yield answer, guesses
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="show the game event log")
+    parser.add_argument("-n", type=int, default=20, help="number of events to show")
+    parser.add_argument(
+        "--games", action="store_true", help="replay the logged games instead"
+    )
+    args = parser.parse_args()
+
+    if args.games:
+        for answer, guesses in replay(read_events()):
+            print(answer, " ".join(word for word, _ in guesses))
+    else:
+        for event in deque(read_events(), maxlen=args.n):
+            print(json.dumps(event))
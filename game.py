@@ -0,0 +1,163 @@
+"""
+The rules of a game of wordle, without any ui.
+
+MainScreen, the simulator and anything else that plays games go through Game
+so they all agree on what a valid guess is and when a game is over.
+"""
+
+import constraints
+import scoring
+
+WORD_LEN = 5
+MAX_TRIES = 6
+
+
+class InvalidGuess(ValueError):
+    """a guess that was rejected, the message is meant for the player"""
+
+
+class Game:
+    """a single game against a known answer"""
+
+    def __init__(self, answer, valid_words, max_tries=MAX_TRIES, hard=False):
+        self.answer = answer
+        self.valid_words = valid_words
+        self.max_tries = max_tries
+        self.word_len = len(answer)
+        self.history = []
+        # the hints every guess has to use in hard mode
+        self.hard = constraints.HardMode(valid_words) if hard else None
+
+    @property
+    def won(self):
+        return bool(self.history) and self.history[-1][1] == scoring.solved_pattern(
+            self.word_len
+        )
+
+    @property
+    def over(self):
+        return self.won or len(self.history) >= self.max_tries
+
+    def guess(self, word):
+        """play a word and return its pattern, raises InvalidGuess"""
+        validate(self, word)
+        if self.hard is not None:
+            reason = self.hard.violation(word)
+            if reason:
+                raise InvalidGuess(reason)
+        pattern = scoring.score(word, self.answer)
+        self.history.append((word, pattern))
+        if self.hard is not None:
+            self.hard.add(word, pattern)
+        return pattern
+
+    def allowed(self):
+        """the words that may be guessed next, every valid word unless in hard mode"""
+        if self.hard is None:
+            return list(self.valid_words)
+        return self.hard.allowed()
+
+
+class MultiGame:
+    """
+    every guess is played against several answers at once, one board per
+    answer, and a board stops taking guesses once it is solved
+    """
+
+    def __init__(self, answers, valid_words, max_tries=None):
+        self.answers = list(answers)
+        self.valid_words = valid_words
+        self.word_len = len(self.answers[0])
+        # one extra try for every board, like quordle's 9 tries for 4 boards
+        if max_tries is None:
+            max_tries = self.word_len + len(self.answers)
+        self.max_tries = max_tries
+        # (guess, patterns) with a None pattern for boards solved before it
+        self.history = []
+        # the try each board was solved on
+        self.solved = [None] * len(self.answers)
+
+    @property
+    def won(self):
+        return None not in self.solved
+
+    @property
+    def over(self):
+        return self.won or len(self.history) >= self.max_tries
+
+    def active(self):
+        """the boards that are not solved yet"""
+        return [i for i, tries in enumerate(self.solved) if tries is None]
+
+    def guess(self, word):
+        """play a word on every unsolved board and return their patterns"""
+        validate(self, word)
+        active = self.active()
+        scores = scoring.score_many(word, [self.answers[i] for i in active])
+        solved = scoring.solved_pattern(self.word_len)
+
+        patterns = [None] * len(self.answers)
+        for i, pattern in zip(active, scores):
+            patterns[i] = pattern
+            if pattern == solved:
+                self.solved[i] = len(self.history) + 1
+        self.history.append((word, patterns))
+        return patterns
+
+
+class AbsurdGame:
+    """
+    a game without an answer (absurdle): every guess gets the pattern that
+    most of the remaining answers would give it, and only those remain
+    """
+
+    def __init__(self, answers, valid_words, max_tries=None, hard=False):
+        self.valid_words = valid_words
+        self.word_len = len(answers[0])
+        # no limit unless given, the game is over once it's won
+        self.max_tries = max_tries
+        self.history = []
+        self.hard = constraints.HardMode(valid_words) if hard else None
+        # the answers still possible, as a (count, word_len) uint8 array
+        self.remaining = scoring.to_array(answers)
+
+    @property
+    def answer(self):
+        """one of the answers still possible, the answer once the game is won"""
+        return bytes(self.remaining[0]).decode("ascii")
+
+    @property
+    def won(self):
+        return bool(self.history) and self.history[-1][1] == scoring.solved_pattern(
+            self.word_len
+        )
+
+    @property
+    def over(self):
+        if self.max_tries is None:
+            return self.won
+        return self.won or len(self.history) >= self.max_tries
+
+    def guess(self, word):
+        """play a word against the largest group of answers left, raises InvalidGuess"""
+        validate(self, word)
+        if self.hard is not None:
+            reason = self.hard.violation(word)
+            if reason:
+                raise InvalidGuess(reason)
+        pattern, keep = scoring.largest_bucket(word, self.remaining)
+        self.remaining = self.remaining[keep]
+        self.history.append((word, pattern))
+        if self.hard is not None:
+            self.hard.add(word, pattern)
+        return pattern
+
+
+def validate(game, word):
+    """raise InvalidGuess if word can't be played in game"""
+    if game.over:
+        raise InvalidGuess("Game Over")
+    if len(word) < game.word_len:
+        raise InvalidGuess("Not Enough Letters")
+    if word not in game.valid_words:
+        raise InvalidGuess("Not in word list")
@@ -0,0 +1,124 @@
+"""
+Import a custom wordlist into the packed format the game plays from.
+
+    python ingest.py path/to/dictionary.txt [--name NAME]
+
+The file is streamed line by line: every line is unicode normalized with
+accents stripped and upper-cased, anything that isn't a single word of a
+playable length is dropped. Words are buffered up to a fixed number, written
+out as sorted runs and finally merged run by run into one packed file per
+word length, dropping duplicates on the way. Memory use stays bounded by the
+buffer size no matter how big the input is.
+"""
+
+from pathlib import Path
+
+import argparse
+import heapq
+import re
+import sys
+import tempfile
+import time
+import unicodedata
+
+import words
+
+# words held in memory before they are spilled to a sorted run
+CHUNK_SIZE = 200_000
+# call the progress callback every this many lines
+PROGRESS_EVERY = 50_000
+
+
+def read_lines(path, progress=None):
+    """stream the lines of a file, reporting (bytes read, total bytes, lines)"""
+    total = Path(path).stat().st_size
+    done = n = 0
+    with open(path, "rb") as f:
+        for n, raw in enumerate(f, 1):
+            done += len(raw)
+            yield raw.decode("utf-8", errors="replace")
+            if progress and n % PROGRESS_EVERY == 0:
+                progress(done, total, n)
+    if progress:
+        progress(done, total, n)
+
+
+def normalize(lines, lengths=words.WORD_LENGTHS):
+    """upper-cased ascii words of a playable length, everything else is dropped"""
+    for line in lines:
+        word = unicodedata.normalize("NFKD", line.strip())
+        word = "".join(c for c in word if not unicodedata.combining(c)).upper()
+        if word.isascii() and word.isalpha() and len(word) in lengths:
+            yield word
+
+
+def _spill(buffer, directory, runs):
+    """write every length in the buffer as a sorted run and empty it"""
+    for length, chunk in buffer.items():
+        run = Path(directory) / f"{length}-{len(runs.get(length, ()))}.txt"
+        with open(run, "w") as f:
+            f.writelines(f"{word}\n" for word in sorted(chunk))
+        runs.setdefault(length, []).append(run)
+    buffer.clear()
+
+
+def _merge(runs):
+    """merge sorted runs into a single sorted stream without duplicates"""
+    files = [open(run) for run in runs]
+    try:
+        previous = None
+        for line in heapq.merge(*files):
+            word = line.rstrip("\n")
+            if word != previous:
+                yield word
+                previous = word
+    finally:
+        for f in files:
+            f.close()
+
+
+def ingest(path, name, progress=None, chunk_size=CHUNK_SIZE):
+    """import a wordlist file as name and return {length: number of words}"""
+    counts = {}
+    with tempfile.TemporaryDirectory(prefix="pywordle-") as directory:
+        runs = {}
+        buffer = {}
+        buffered = 0
+        for word in normalize(read_lines(path, progress)):
+            chunk = buffer.setdefault(len(word), set())
+            if word not in chunk:
+                chunk.add(word)
+                buffered += 1
+            if buffered >= chunk_size:
+                _spill(buffer, directory, runs)
+                buffered = 0
+        _spill(buffer, directory, runs)
+
+        for length, length_runs in runs.items():
+            counts[length] = words.write_custom(name, length, _merge(length_runs))
+    return counts
+
+
+def wordlist_name(path):
+    """a file name safe wordlist name for a dictionary file"""
+    return re.sub(r"[^A-Za-z0-9_]+", "_", Path(path).stem).strip("_") or "custom"
+
+
+def print_progress(done, total, lines):
+    percent = 100 * done / total if total else 100
+    print(f"\r{percent:5.1f}% {lines} lines", end="", file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="import a custom wordlist")
+    parser.add_argument("path", help="text file with one word per line")
+    parser.add_argument("--name", help="name to import it as (default: file name)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    name = args.name or wordlist_name(args.path)
+    counts = ingest(args.path, name, print_progress)
+    print(file=sys.stderr)
+    for length, count in sorted(counts.items()):
+        print(f"{words.custom_path(name, length)}: {count} words")
+    print(f"imported {name} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,157 @@
+"""
+Load test a running server.py.
+
+    python loadtest.py [--url http://127.0.0.1:8080] [-c 50] [-d 10] [--ws]
+
+Every client opens one keep-alive connection (or a websocket with --ws) and
+plays games in a loop: a new game, then random guesses until it is over.
+The requests per second and the latency percentiles are printed at the end.
+"""
+
+from urllib.parse import urlsplit
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import statistics
+import time
+
+import server
+import words
+
+
+class Client:
+    """one connection to the server, http with keep-alive or a websocket"""
+
+    def __init__(self, host, port, websocket=False):
+        self.host = host
+        self.port = port
+        self.websocket = websocket
+        self.session = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        if self.websocket:
+            key = base64.b64encode(os.urandom(16)).decode()
+            self.writer.write(
+                (
+                    "GET /ws HTTP/1.1\r\n"
+                    f"Host: {self.host}:{self.port}\r\n"
+                    "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+                ).encode()
+            )
+            await self.reader.readuntil(b"\r\n\r\n")
+
+    async def new(self):
+        if self.websocket:
+            reply = await self.message({"type": "new"})
+        else:
+            reply = await self.request("POST", "/new", {})
+        self.session = reply["session"]
+        return reply
+
+    async def guess(self, word):
+        if self.websocket:
+            return await self.message({"type": "guess", "word": word})
+        return await self.request(
+            "POST", "/guess", {"session": self.session, "word": word}
+        )
+
+    async def request(self, method, path, payload):
+        body = json.dumps(payload).encode()
+        self.writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode()
+            + body
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.decode("latin-1").split("\r\n"):
+            name, _, value = line.partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return json.loads(await self.reader.readexactly(length))
+
+    async def message(self, payload):
+        data = json.dumps(payload).encode()
+        self.writer.write(server.frame(0x1, data, mask=os.urandom(4)))
+        _, reply = await server.read_frame(self.reader)
+        return json.loads(reply)
+
+    def close(self):
+        self.writer.close()
+
+
+async def play(client, guesses, deadline, latencies, rng):
+    """play games until the deadline, recording the latency of every request"""
+    await client.connect()
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await client.new()
+            latencies.append(time.perf_counter() - start)
+
+            over = False
+            while not over and time.perf_counter() < deadline:
+                start = time.perf_counter()
+                reply = await client.guess(rng.choice(guesses))
+                latencies.append(time.perf_counter() - start)
+                over = reply.get("over", False)
+    finally:
+        client.close()
+
+
+async def run(url, concurrency, duration, websocket=False, seed=None):
+    """latencies in seconds of every request made in duration seconds"""
+    parts = urlsplit(url)
+    guesses = list(words.load_all_words())
+    rng = random.Random(seed)
+    latencies = []
+    deadline = time.perf_counter() + duration
+    clients = [
+        play(
+            Client(parts.hostname, parts.port or 80, websocket),
+            guesses,
+            deadline,
+            latencies,
+            random.Random(rng.random()),
+        )
+        for _ in range(concurrency)
+    ]
+    await asyncio.gather(*clients)
+    return latencies
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def report(latencies, duration):
+    latencies = sorted(latencies)
+    print(f"requests: {len(latencies)}")
+    print(f"req/s:    {len(latencies) / duration:.0f}")
+    if latencies:
+        print(f"mean:     {statistics.fmean(latencies) * 1e3:.2f} ms")
+        for name, p in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+            print(f"{name + ':':<10}{percentile(latencies, p) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="load test server.py")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("-d", "--duration", type=float, default=10)
+    parser.add_argument("--ws", action="store_true", help="play over websockets")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    latencies = asyncio.run(
+        run(args.url, args.concurrency, args.duration, args.ws, args.seed)
+    )
+    report(latencies, args.duration)
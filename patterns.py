@@ -0,0 +1,99 @@
+"""
+Precomputed feedback patterns for every (guess, answer) pair.
+
+The matrix is built once from the files in wordlists/ and saved as a .npy
+file in the cache directory. The file name contains a hash of both wordlists
+so it is rebuilt automatically whenever they change. Later runs open it with
+mmap, which makes loading instant and lets processes share the pages.
+
+Run this module directly to (re)build the cache:
+
+    python patterns.py [--rebuild]
+"""
+
+from functools import lru_cache
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+import scoring
+import words
+
+CACHE_VERSION = 1
+
+
+class PatternMatrix:
+    """a (guess x answer) matrix of patterns together with the word orders"""
+
+    def __init__(self, guesses, answers, matrix):
+        self.guesses = guesses
+        self.answers = answers
+        self.matrix = matrix
+        self.guess_index = {word: i for i, word in enumerate(guesses)}
+        self.answer_index = {word: i for i, word in enumerate(answers)}
+
+    def pattern(self, guess, answer):
+        """pattern for a single pair, a plain array lookup"""
+        return int(self.matrix[self.guess_index[guess], self.answer_index[answer]])
+
+    def row(self, guess):
+        """patterns of a guess against every answer"""
+        return self.matrix[self.guess_index[guess]]
+
+
+def cache_path(length=words.DEFAULT_LENGTH):
+    """path of the cache file for the current wordlists"""
+    digest = words.wordlists_hash(
+        words.load_all_words(length).path, words.load_answers(length).path
+    )[:16]
+    return words.CACHE_DIR / f"patterns-v{CACHE_VERSION}-{length}-{digest}.npy"
+
+
+def build(path, guesses, answers):
+    """score every guess against every answer and save the matrix to path"""
+    matrix = scoring.score_matrix(guesses, answers)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file first so other processes never see half a file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp, path)
+
+    # drop caches that were built from older wordlists
+    length = len(guesses[0])
+    for old in path.parent.glob(f"patterns-v*-{length}-*.npy"):
+        if old != path:
+            old.unlink(missing_ok=True)
+    return matrix
+
+
+@lru_cache(maxsize=2)
+def load(length=words.DEFAULT_LENGTH, rebuild=False):
+    """load the pattern matrix, building the cache file first if needed"""
+    guesses = words.load_all_words(length)
+    answers = words.load_answers(length)
+    path = cache_path(length)
+    if rebuild or not path.exists():
+        build(path, guesses, answers)
+
+    matrix = np.load(path, mmap_mode="r")
+    if matrix.shape != (len(guesses), len(answers)):
+        build(path, guesses, answers)
+        matrix = np.load(path, mmap_mode="r")
+    return PatternMatrix(guesses, answers, matrix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="build the pattern matrix cache")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cache")
+    parser.add_argument("--length", type=int, default=words.DEFAULT_LENGTH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    patterns = load(args.length, rebuild=args.rebuild)
+    elapsed = time.perf_counter() - start
+    print(f"{cache_path(args.length)}: {patterns.matrix.shape} in {elapsed:.2f}s")
@@ -0,0 +1,103 @@
+"""
+Timing report for startup and the hot paths of the ui.
+
+    python wordle.py --profile [report.json] [--profile-stats wordle.prof]
+
+or, for the PyInstaller build, PYWORDLE_PROFILE=report.json and
+PYWORDLE_PROFILE_STATS=wordle.prof in the environment.
+
+Nothing is measured unless profiling is switched on: instrument() replaces
+functions and methods with timed wrappers at runtime, so a normal run pays
+nothing. Startup steps are reported once with the time in milliseconds
+they finished at, counted from when wordle.py started importing, and the
+wrapped calls are reported with their count, total, mean and worst time.
+"""
+
+from functools import wraps
+
+import json
+import os
+import platform
+import sys
+import time
+
+REPORT_VERSION = 1
+
+
+class Profiler:
+    """collects startup steps and per call timings"""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.steps = {}
+        self.calls = {}
+        self._cprofile = None
+
+    def mark(self, name):
+        """record that a startup step finished now"""
+        self.steps[name] = self._since_start()
+
+    def record(self, name, seconds):
+        times = self.calls.setdefault(name, [])
+        times.append(seconds * 1e3)
+
+    def timed(self, name, func):
+        """a wrapper of func that records how long every call takes"""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    def instrument(self, owner, *names):
+        """time every call of owner.name, owner being a class or a module"""
+        prefix = getattr(owner, "__qualname__", owner.__name__)
+        for name in names:
+            func = getattr(owner, name)
+            setattr(owner, name, self.timed(f"{prefix}.{name}", func))
+
+    def start_cprofile(self):
+        import cProfile
+
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def report(self):
+        calls = {}
+        for name, times in self.calls.items():
+            calls[name] = {
+                "count": len(times),
+                "total_ms": sum(times),
+                "mean_ms": sum(times) / len(times),
+                "max_ms": max(times),
+            }
+        return {
+            "version": REPORT_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "frozen": getattr(sys, "frozen", False),
+            "steps": self.steps,
+            "calls": calls,
+        }
+
+    def save(self, path, stats_path=None):
+        """write the json report, and the cProfile stats if they were collected"""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            if stats_path:
+                self._cprofile.dump_stats(stats_path)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def _since_start(self):
+        return (time.perf_counter() - self.started) * 1e3
+
+
+def from_env():
+    """the report and stats paths asked for in the environment"""
+    return os.environ.get("PYWORDLE_PROFILE"), os.environ.get("PYWORDLE_PROFILE_STATS")
@@ -0,0 +1,334 @@
+"""
+Recordings of every finished game, and analytics over them.
+
+    python recordings.py [--length 5] [-n 10] [--path FILE]
+
+Games are appended to a binary file, one file per word length and pair of
+wordlists since words are stored as their index in the lists:
+
+    header  b"PWRC", version, word length, wordlist checksum (2 bytes)
+    record  size, start time, ms played, answer index, guess count,
+            guess indices, key count, then per key its code and the ms
+            since the last key
+
+all numbers varints, which makes a game with its keystrokes 50 to 100 bytes.
+A record is written with a single append, a torn record at the end of the
+file is ignored by the reader and cut off before the next one is added. The
+writer finds the end of the complete records when it appends, scanning on
+from where its last record ended, so records another running game added in
+between are kept.
+
+The reader streams the file in fixed size chunks and jumps over the keys
+unless they are asked for. The analytics only keep a counter per answer and
+per opening word, so memory is bounded by the size of the wordlists no
+matter how many games were recorded.
+"""
+
+from collections import Counter
+from functools import lru_cache
+
+import argparse
+import heapq
+import os
+import struct
+import time
+
+import snapshot
+import words
+
+MAGIC = b"PWRC"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+CHUNK_SIZE = 1 << 20
+# no game comes near this, a bigger size means the file is corrupt from there
+MAX_RECORD_SIZE = 1 << 16
+SIZE_BYTES = len(snapshot.varint(MAX_RECORD_SIZE))
+# key codes past the letters, A to Z are 0 to 25
+KEY_ENTER = 26
+KEY_BACKSPACE = 27
+
+
+class Record:
+    """one recorded game"""
+
+    __slots__ = ("started", "ms", "answer", "guesses", "keys")
+
+    def __init__(self, started, ms, answer, guesses, keys=()):
+        # unix time the game started at and how long it took
+        self.started = started
+        self.ms = ms
+        # indices into the answers and into all the words
+        self.answer = answer
+        self.guesses = guesses
+        # (key code, ms since the previous key) pairs
+        self.keys = keys
+
+    def pack(self):
+        body = bytearray(snapshot.varint(int(self.started)))
+        body += snapshot.varint(self.ms)
+        body += snapshot.varint(self.answer)
+        body += snapshot.varint(len(self.guesses))
+        for i in self.guesses:
+            body += snapshot.varint(i)
+        body += snapshot.varint(len(self.keys))
+        for code, ms in self.keys:
+            body.append(code)
+            body += snapshot.varint(ms)
+        return bytes(snapshot.varint(len(body)) + body)
+
+
+class Recorder:
+    """appends finished games to the recording file of a word length"""
+
+    def __init__(self, length=words.DEFAULT_LENGTH, path=None):
+        self.answers = words.load_answers(length)
+        self.all_words = words.load_all_words(length)
+        self.path = recording_path(length) if path is None else path
+        self.header = header(length, self.answers, self.all_words)
+        # where our last record ended, the scan for the end starts there
+        self.offset = None
+
+    def record(self, started, seconds, answer, guesses, keys=()):
+        """record a game, see pack()"""
+        self.append(self.pack(started, seconds, answer, guesses, keys))
+
+    def pack(self, started, seconds, answer, guesses, keys=()):
+        """
+        the record of a game, keys being (key, time) pairs with key a letter,
+        "ENTER" or "BACKSPACE" and time.monotonic() seconds
+        """
+        timings = []
+        last = None
+        for key, at in keys:
+            ms = 0 if last is None else round((at - last) * 1000)
+            timings.append((key_code(key), ms))
+            last = at
+        record = Record(
+            started,
+            round(seconds * 1000),
+            self.answers.index(answer),
+            [self.all_words.index(word) for word in guesses],
+            timings,
+        )
+        return record.pack()
+
+    def append(self, data):
+        """append a packed record, the file i/o of record() for a worker thread"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+b") as f:
+            end = _valid_end(f, self.offset)
+            if f.seek(0, os.SEEK_END) != end:
+                # drop a record torn by a crash before adding ours
+                f.truncate(end)
+            if end == 0:
+                data = self.header + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.offset = end + len(data)
+
+
+def header(length, answers, all_words):
+    checksum = snapshot.checksum(answers, all_words)
+    return HEADER.pack(MAGIC, VERSION, length, checksum)
+
+
+def recording_path(length=words.DEFAULT_LENGTH):
+    """the recording file of the default wordlists of a word length"""
+    answers = words.load_answers(length)
+    checksum = snapshot.checksum(answers, words.load_all_words(length))
+    return words.DATA_DIR / f"games-{length}-{checksum:04x}.rec"
+
+
+@lru_cache(maxsize=None)
+def key_code(key):
+    if key == "ENTER":
+        return KEY_ENTER
+    if key == "BACKSPACE":
+        return KEY_BACKSPACE
+    return ord(key) - ord("A")
+
+
+def read_records(path, keys=False, chunk_size=CHUNK_SIZE):
+    """
+    stream the records of a recording file, a chunk of the file at a time,
+    with their keys only if asked for
+    """
+    with open(path, "rb") as f:
+        if not _read_header(f):
+            raise ValueError(f"{path} is not a recording file")
+        for data, start, _ in _scan(f, chunk_size):
+            yield _parse(data, start, keys)
+
+
+def valid_end(path, offset=None, chunk_size=CHUNK_SIZE):
+    """
+    the offset after the last complete record of a recording file, 0 if
+    there is no file or it isn't a recording. offset, the end of a record
+    already known, saves scanning the records before it
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return 0
+    with f:
+        return _valid_end(f, offset, chunk_size)
+
+
+def _valid_end(f, offset=None, chunk_size=CHUNK_SIZE):
+    size = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    if not _read_header(f):
+        return 0
+    if offset is None or not HEADER.size <= offset <= size:
+        offset = HEADER.size
+    f.seek(offset)
+    end = offset
+    for _, _, end in _scan(f, chunk_size, offset):
+        pass
+    return end
+
+
+def _read_header(f):
+    head = f.read(HEADER.size)
+    if len(head) < HEADER.size:
+        return False
+    magic, version, _, _ = HEADER.unpack(head)
+    return magic == MAGIC and version == VERSION
+
+
+def _scan(f, chunk_size, base=HEADER.size):
+    """
+    the complete records from base on, where f is, as the buffer holding
+    one, where it starts in the buffer and the file offset after it. stops
+    at a size no record can have, so a corrupt file isn't read into memory
+    """
+    buffer = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        buffer += chunk
+        pos = 0
+        while True:
+            try:
+                size, start = snapshot.read_varint(buffer, pos)
+            except ValueError:
+                if len(buffer) - pos >= SIZE_BYTES:
+                    return
+                break
+            if size > MAX_RECORD_SIZE or start - pos > SIZE_BYTES:
+                return
+            end = start + size
+            if end > len(buffer):
+                break
+            yield buffer, start, base + end
+            pos = end
+        base += pos
+        buffer = buffer[pos:]
+
+
+def _parse(data, pos, with_keys):
+    started, pos = snapshot.read_varint(data, pos)
+    ms, pos = snapshot.read_varint(data, pos)
+    answer, pos = snapshot.read_varint(data, pos)
+    count, pos = snapshot.read_varint(data, pos)
+    guesses = []
+    for _ in range(count):
+        i, pos = snapshot.read_varint(data, pos)
+        guesses.append(i)
+    if not with_keys:
+        return Record(started, ms, answer, guesses)
+    count, pos = snapshot.read_varint(data, pos)
+    keys = []
+    for _ in range(count):
+        code = data[pos]
+        delta, pos = snapshot.read_varint(data, pos + 1)
+        keys.append((code, delta))
+    return Record(started, ms, answer, guesses, keys)
+
+
+class Analytics:
+    """running totals over a stream of records, a few counters per answer"""
+
+    def __init__(self, answers, all_words, max_tries):
+        self.answers = answers
+        self.all_words = all_words
+        self.max_tries = max_tries
+        self.games = 0
+        self.played = Counter()
+        self.lost = Counter()
+        # guesses per answer, a lost game counts as max_tries + 1
+        self.guesses = Counter()
+        self.openers = Counter()
+        self.ms = 0
+
+    def add(self, record):
+        answer = self.answers[record.answer]
+        won = bool(record.guesses) and self.all_words[record.guesses[-1]] == answer
+        self.games += 1
+        self.played[record.answer] += 1
+        self.guesses[record.answer] += (
+            len(record.guesses) if won else self.max_tries + 1
+        )
+        if not won:
+            self.lost[record.answer] += 1
+        if record.guesses:
+            self.openers[record.guesses[0]] += 1
+        self.ms += record.ms
+
+    def average_guesses(self, answer_index):
+        return self.guesses[answer_index] / self.played[answer_index]
+
+    def hardest(self, n=10, min_games=1):
+        """the n answers with the most guesses on average"""
+        eligible = (i for i, count in self.played.items() if count >= min_games)
+        hardest = heapq.nlargest(n, eligible, key=self.average_guesses)
+        return [(self.answers[i], self.average_guesses(i)) for i in hardest]
+
+    def common_openers(self, n=10):
+        return [(self.all_words[i], count) for i, count in self.openers.most_common(n)]
+
+
+def analyze(path, length=words.DEFAULT_LENGTH):
+    """Analytics of every game in a recording file"""
+    analytics = Analytics(
+        words.load_answers(length), words.load_all_words(length), length + 1
+    )
+    for record in read_records(path):
+        analytics.add(record)
+    return analytics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="analyze the recorded games")
+    parser.add_argument(
+        "--length",
+        type=int,
+        default=words.DEFAULT_LENGTH,
+        choices=words.available_lengths(),
+    )
+    parser.add_argument("--path", help="recording file (default: the one in use)")
+    parser.add_argument("-n", type=int, default=10, help="rows in every table")
+    parser.add_argument(
+        "--min-games", type=int, default=1, help="games an answer needs to rank"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = args.path or recording_path(args.length)
+    a = analyze(path, args.length)
+    elapsed = time.perf_counter() - start
+
+    print(f"{a.games} games in {elapsed:.2f}s")
+    if a.games:
+        total = sum(a.guesses.values())
+        average = total / a.games
+        print(f"average guesses: {average:.2f} (a loss counts as {a.max_tries + 1})")
+        print(f"average game time: {a.ms / a.games / 1000:.1f}s")
+        print("\nhardest answers:")
+        for answer, average in a.hardest(args.n, args.min_games):
+            print(f"  {answer} {average:.2f}")
+        print("\nmost common openers:")
+        for word, count in a.common_openers(args.n):
+            print(f"  {word} {count}")
@@ -0,0 +1,87 @@
+"""
+Diff based widget updates.
+
+Every widget option change is a round trip to Tcl, and on a slow remote
+desktop a redraw of the whole grid adds up. The Renderer keeps a shadow copy
+of the options it has set on each widget, queues changes and sends only the
+options that actually differ, one configure() per widget, from an after_idle
+callback so everything that changed in one event-loop turn goes out together.
+"""
+
+from collections import Counter
+
+_MISSING = object()
+
+
+class Renderer:
+    """batches widget option changes and skips the ones that change nothing"""
+
+    def __init__(self, root):
+        self.root = root
+        self._shadow = {}
+        self._pending = {}
+        self._scheduled = None
+        self._action = None
+        # how many times each action ran and how many tk calls it caused
+        self.actions = Counter()
+        self.calls = Counter()
+
+    def register(self, widget, **options):
+        """record the options a widget was created with"""
+        self._shadow[widget] = dict(options)
+
+    def set(self, widget, **options):
+        """queue option changes for a widget"""
+        shadow = self._shadow.setdefault(widget, {})
+        pending = self._pending.get(widget)
+        for name, value in options.items():
+            if pending is not None and name in pending:
+                pending[name] = value
+            elif shadow.get(name, _MISSING) != value:
+                if pending is None:
+                    pending = self._pending[widget] = {}
+                pending[name] = value
+
+        if self._pending and self._scheduled is None:
+            self._scheduled = self.root.after_idle(self._flush_idle)
+
+    def _flush_idle(self):
+        self._scheduled = None
+        self.flush()
+
+    def flush(self):
+        """send the queued changes to tk right away"""
+        if self._scheduled is not None:
+            self.root.after_cancel(self._scheduled)
+            self._scheduled = None
+
+        pending, self._pending = self._pending, {}
+        for widget, options in pending.items():
+            shadow = self._shadow[widget]
+            changes = {
+                name: value
+                for name, value in options.items()
+                if shadow.get(name, _MISSING) != value
+            }
+            if changes:
+                widget.configure(**changes)
+                shadow.update(changes)
+                self.calls[self._action] += 1
+
+    def action(self, name):
+        """mark the start of a user action, tk calls are counted against it"""
+        self._action = name
+        self.actions[name] += 1
+
+    def forget(self, widget):
+        """stop tracking a widget that was destroyed"""
+        self._shadow.pop(widget, None)
+        self._pending.pop(widget, None)
+
+    def report(self):
+        """average number of tk calls per action"""
+        return {
+            name: self.calls[name] / count
+            for name, count in self.actions.items()
+            if count
+        }
@@ -0,0 +1,201 @@
+"""
+Headless scoring engine for wordle guesses.
+
+Feedback for a guess is encoded as a base-3 integer where the digit for
+position i (least significant first) is one of ABSENT, PRESENT or CORRECT,
+so a 5 letter word scores to a pattern in the range 0..242.
+
+The batch functions need numpy, everything else is pure python. numpy is
+imported on the first batch call so the game can score without paying for it.
+"""
+
+# set by _require_numpy()
+np = None
+
+
+ABSENT = 0
+PRESENT = 1
+CORRECT = 2
+
+# answers from which score_many hands the work to numpy
+BATCH_THRESHOLD = 128
+
+
+def score(guess, answer):
+    """score a single guess against an answer and return its pattern"""
+    remaining = {}
+    for x, y in zip(guess, answer):
+        if x != y:
+            remaining[y] = remaining.get(y, 0) + 1
+
+    pattern = 0
+    power = 1
+    for x, y in zip(guess, answer):
+        if x == y:
+            pattern += CORRECT * power
+        elif remaining.get(x, 0) > 0:
+            pattern += PRESENT * power
+            remaining[x] -= 1
+        power *= 3
+    return pattern
+
+
+def score_many(guess, answers):
+    """
+    score one guess against a list of answers, numpy only pays off for
+    long lists, a few boards worth of answers are scored in python
+    """
+    if len(answers) < BATCH_THRESHOLD:
+        return [score(guess, answer) for answer in answers]
+    return score_batch(guess, answers).tolist()
+
+
+def encode(digits):
+    """turn a sequence of ABSENT/PRESENT/CORRECT digits into a pattern"""
+    pattern = 0
+    for digit in reversed(digits):
+        pattern = pattern * 3 + digit
+    return pattern
+
+
+def decode(pattern, length=5):
+    """turn a pattern back into a tuple of ABSENT/PRESENT/CORRECT digits"""
+    digits = []
+    for _ in range(length):
+        pattern, digit = divmod(pattern, 3)
+        digits.append(digit)
+    return tuple(digits)
+
+
+def solved_pattern(length=5):
+    """the pattern of a guess that matches the answer"""
+    return 3**length - 1
+
+
+def pattern_dtype(length=5):
+    """the smallest unsigned numpy dtype that can hold a pattern"""
+    _require_numpy()
+    return np.uint8 if 3**length <= 256 else np.uint16
+
+
+def to_array(words):
+    """convert a word or a sequence of equal length words to a uint8 array"""
+    _require_numpy()
+    if isinstance(words, str):
+        return np.frombuffer(words.encode("ascii"), dtype=np.uint8)
+    if hasattr(words, "array"):  # packed wordlists can hand out their buffer
+        return words.array()
+    words = list(words)
+    if not words:
+        return np.zeros((0, 0), dtype=np.uint8)
+    length = len(words[0])
+    data = "".join(words).encode("ascii")
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(words), length)
+
+
+def score_batch(guess, answers):
+    """score one guess against many answers and return an array of patterns"""
+    _require_numpy()
+    g = to_array(guess) if isinstance(guess, str) else guess
+    a = answers if isinstance(answers, np.ndarray) else to_array(answers)
+    if not len(a):
+        return np.zeros(0, dtype=pattern_dtype(len(g)))
+    if a.shape[1] != len(g):
+        raise ValueError("guesses and answers must have the same length")
+    return _score_one(g, a).astype(pattern_dtype(len(g)), copy=False)
+
+
+def largest_bucket(guess, answers):
+    """
+    the pattern most of the answers give for guess and a mask of those
+    answers, a tie goes to the lowest pattern
+    """
+    _require_numpy()
+    codes = score_batch(guess, answers)
+    counts = np.bincount(codes, minlength=3 ** len(guess))
+    pattern = int(counts.argmax())
+    return pattern, codes == pattern
+
+
+def score_matrix(guesses, answers, chunk_size=1024):
+    """
+    score many guesses against many answers, returns an array of patterns of
+    shape (len(guesses), len(answers)).
+
+    guesses and answers can either be sequences of words or uint8 arrays as
+    returned by to_array(). guesses are processed in chunks of chunk_size to
+    keep the temporary arrays small.
+    """
+    _require_numpy()
+    g = guesses if isinstance(guesses, np.ndarray) else to_array(guesses)
+    a = answers if isinstance(answers, np.ndarray) else to_array(answers)
+    if g.ndim == 1:
+        g = g[None, :]
+    if a.ndim == 1:
+        a = a[None, :]
+    length = g.shape[1]
+    if len(a) and a.shape[1] != length:
+        raise ValueError("guesses and answers must have the same length")
+
+    out = np.empty((len(g), len(a)), dtype=pattern_dtype(length))
+    for start in range(0, len(g), chunk_size):
+        out[start : start + chunk_size] = _score_chunk(g[start : start + chunk_size], a)
+    return out
+
+
+def _score_chunk(g, a):
+    length = g.shape[1]
+    # green[:, :, i] is true where guess and answer share the letter at i
+    green = g[:, None, :] == a[None, :, :]
+    pattern = np.zeros((len(g), len(a)), dtype=np.uint16)
+    power = 1
+    for i in range(length):
+        letter = g[:, i, None]
+        # letters of the answer that are still unmatched after the greens
+        available = np.zeros(pattern.shape, dtype=np.uint8)
+        for j in range(length):
+            available += (a[None, :, j] == letter) & ~green[:, :, j]
+        # earlier non-green occurrences of the same letter in the guess
+        # have already used up some of them
+        used = np.zeros(pattern.shape, dtype=np.uint8)
+        for k in range(i):
+            used += (g[:, k, None] == letter) & ~green[:, :, k]
+        present = ~green[:, :, i] & (used < available)
+        pattern += green[:, :, i] * np.uint16(CORRECT * power)
+        pattern += present * np.uint16(PRESENT * power)
+        power *= 3
+    return pattern
+
+
+def _score_one(g, a):
+    """
+    _score_chunk for a single guess, on the columns of the answers so every
+    step is one pass over a contiguous array
+    """
+    length = len(g)
+    columns = np.ascontiguousarray(a.T)
+    not_green = columns != g[:, None]
+    pattern = np.zeros(len(a), dtype=np.uint16)
+    for i in range(length):
+        pattern += ~not_green[i] * np.uint16(CORRECT * 3**i)
+    for letter in set(g.tolist()):
+        # copies of the letter in the answer that aren't matched by a green
+        available = np.zeros(len(a), dtype=np.uint8)
+        for j in range(length):
+            available += (columns[j] == letter) & not_green[j]
+        # and they go to the copies in the guess from left to right
+        used = np.zeros(len(a), dtype=np.uint8)
+        for i in np.flatnonzero(g == letter):
+            pattern += (not_green[i] & (used < available)) * np.uint16(PRESENT * 3**i)
+            used += not_green[i]
+    return pattern
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is required for batch scoring") from None
+        np = numpy
@@ -0,0 +1,144 @@
+"""
+Search a wordlist by pattern, e.g. the 5 letter words like ?R?NE with a C
+and without an A.
+
+    python search.py ?R?NE [-i C] [-x A] [--answers] [--wordlist NAME] [-n 100]
+
+The index keeps a sorted posting list of word ids for every (position,
+letter) and for every letter anywhere in the word. A search intersects the
+lists the pattern and the included letters pick, smallest first: every id
+of the smallest list is looked up in the others with a bisect that starts
+where the last one ended. Excluded letters are checked on the words that
+survive. Matches come out lazily in wordlist order, so the first page of
+a broad search over a large dictionary costs no more than that page.
+"""
+
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import islice
+
+import argparse
+
+import words
+
+WILDCARDS = "?._*"
+PAGE_SIZE = 100
+
+
+class SearchIndex:
+    """inverted index of a wordlist by letter and position"""
+
+    def __init__(self, wordlist):
+        self.words = list(wordlist)
+        self.word_len = len(self.words[0]) if self.words else 0
+        # position[p][c]: ids of the words with c at position p
+        self.position = [{} for _ in range(self.word_len)]
+        # containing[c]: ids of the words with c anywhere
+        self.containing = {}
+        for i, word in enumerate(self.words):
+            for p, c in enumerate(word):
+                postings = self.position[p].get(c)
+                if postings is None:
+                    postings = self.position[p][c] = array("I")
+                postings.append(i)
+            for c in set(word):
+                postings = self.containing.get(c)
+                if postings is None:
+                    postings = self.containing[c] = array("I")
+                postings.append(i)
+
+    def search(self, pattern, include="", exclude=""):
+        """
+        the words matching pattern, a letter or a wildcard per position,
+        that have every letter of include and none of exclude
+        """
+        pattern, include, exclude = parse(pattern, include, exclude)
+        if len(pattern) != self.word_len:
+            raise ValueError(f"the pattern needs {self.word_len} letters")
+
+        lists = []
+        for p, c in enumerate(pattern):
+            if c not in WILDCARDS:
+                lists.append(self.position[p].get(c, ()))
+        for c in include:
+            lists.append(self.containing.get(c, ()))
+
+        excluded = set(exclude)
+        if excluded & (set(pattern) | set(include)):
+            return
+        for i in intersect(lists) if lists else range(len(self.words)):
+            word = self.words[i]
+            if excluded.isdisjoint(word):
+                yield word
+
+    def page(self, pattern, include="", exclude="", size=PAGE_SIZE):
+        """the first size matches and an iterator over the rest"""
+        matches = self.search(pattern, include, exclude)
+        return list(islice(matches, size)), matches
+
+
+def parse(pattern, include="", exclude=""):
+    """normalize a search, raises ValueError for characters it can't have"""
+    pattern = pattern.strip().upper()
+    include = "".join(sorted(set(include.upper()) - set(" ,")))
+    exclude = "".join(sorted(set(exclude.upper()) - set(" ,")))
+    for c in pattern:
+        if not (c in WILDCARDS or "A" <= c <= "Z"):
+            raise ValueError(f"{c!r} is neither a letter nor one of {WILDCARDS}")
+    for c in include + exclude:
+        if not "A" <= c <= "Z":
+            raise ValueError(f"{c!r} is not a letter")
+    return pattern, include, exclude
+
+
+def intersect(lists):
+    """ids in every one of some sorted lists, in order"""
+    lists = sorted(lists, key=len)
+    smallest, rest = lists[0], lists[1:]
+    starts = [0] * len(rest)
+    for i in smallest:
+        for k, other in enumerate(rest):
+            j = bisect_left(other, i, starts[k])
+            starts[k] = j
+            if j == len(other) or other[j] != i:
+                break
+        else:
+            yield i
+
+
+@lru_cache(maxsize=words.SHARDS_CACHED)
+def load_index(wordlist):
+    """build, or reuse, the search index for a wordlist"""
+    return SearchIndex(wordlist)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="search a wordlist by pattern")
+    parser.add_argument("pattern", help=f"a letter or one of {WILDCARDS} per position")
+    parser.add_argument("-i", "--include", default="", help="letters it must contain")
+    parser.add_argument("-x", "--exclude", default="", help="letters it can't contain")
+    parser.add_argument(
+        "--answers", action="store_true", help="search the answers, not every guess"
+    )
+    parser.add_argument("--wordlist", help="an imported wordlist, see ingest.py")
+    parser.add_argument("-n", type=int, help="show at most this many words")
+    args = parser.parse_args()
+
+    length = len(args.pattern.strip())
+    if args.wordlist is None:
+        lengths = words.available_lengths()
+    else:
+        lengths = words.custom_wordlists().get(args.wordlist, ())
+    if length not in lengths:
+        parser.error(f"there is no wordlist of {length} letter words")
+    if args.answers:
+        wordlist = words.load_answers(length, args.wordlist)
+    else:
+        wordlist = words.load_all_words(length, args.wordlist)
+    try:
+        matches = load_index(wordlist).search(args.pattern, args.include, args.exclude)
+        for word in islice(matches, args.n):
+            print(word)
+    except ValueError as e:
+        parser.error(str(e))
@@ -0,0 +1,462 @@
+"""
+Play wordle over HTTP or a WebSocket, no Tk needed.
+
+    python server.py [--host 127.0.0.1] [--port 8080] [-j WORKERS] [--length 5]
+
+HTTP api, JSON in and out:
+
+    POST /new    [{"code"}]                  -> {"session", "word_len", "max_tries"}
+    POST /guess  {"session", "word"}         -> {"word", "pattern", "won", "over"}
+    GET  /state?session=ID                   -> {"guesses", "patterns", "won", "over",
+                                                 "code"}
+    GET  /ws                                 -> WebSocket, send {"type": "new"} or
+                                                {"type": "guess", "word": ...}
+
+Games follow the same rules as the window, every guess goes through
+game.Game. Sessions are packed game snapshots (see snapshot.py) kept in a
+table of fixed size records in shared memory, which is created before the
+workers are forked, so any worker can serve any session. The code of a
+game is the same snapshot as a share code, a new game can start from one.
+The wordlists are mmapped packed files, the workers share them through the
+page cache.
+"""
+
+from urllib.parse import parse_qs, urlsplit
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import secrets
+import socket
+import struct
+
+import deck
+import game
+import snapshot
+import words
+
+# sessions kept at once, the oldest are reused once the table is full
+CAPACITY = 1 << 17
+# locks shared by the workers, a session uses the one of its slot
+LOCKS = 64
+MAX_BODY = 4096
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC11B65"
+STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+}
+
+
+class Session:
+    """one game as read from the session table"""
+
+    __slots__ = ("slot", "nonce", "state")
+
+    def __init__(self, slot, nonce, state):
+        self.slot = slot
+        self.nonce = nonce
+        self.state = state
+
+    @property
+    def id(self):
+        return f"{self.slot:x}-{self.nonce:x}"
+
+
+class SessionTable:
+    """
+    sessions in fixed size records in a shared mmap: a nonce and the packed
+    snapshot of the game, 32 bytes for 6 tries. Worker i of n only hands out
+    slots i, i + n, ... in a ring, so workers never hand out the same slot.
+    A session id is its slot and nonce, a stale id of a reused slot no longer
+    matches the nonce. Records are read and written under a lock of their
+    slot, shared with the forked workers, so two workers playing the same
+    session can't interleave a read and a write.
+    """
+
+    def __init__(self, answers, all_words, capacity=CAPACITY, max_tries=6):
+        self.answers = answers
+        self.all_words = all_words
+        self.capacity = capacity
+        # header and up to 3 varint bytes for the answer and every guess
+        self.record = struct.Struct(f"<IB{6 + 3 * (max_tries + 1)}s")
+        self.buffer = mmap.mmap(-1, capacity * self.record.size)
+        self.locks = [multiprocessing.RLock() for _ in range(LOCKS)]
+        self.worker = 0
+        self.workers = 1
+        self._cursor = 0
+
+    def partition(self, worker, workers):
+        """only allocate the slots of this worker from now on"""
+        self.worker, self.workers = worker, workers
+        self._cursor = 0
+
+    def new(self, state):
+        slot = self.worker + self._cursor * self.workers
+        self._cursor += 1
+        if self.worker + self._cursor * self.workers >= self.capacity:
+            self._cursor = 0
+        session = Session(slot, secrets.randbits(32) | 1, state)
+        self.save(session)
+        return session
+
+    def locked(self, session_id):
+        """the lock to hold to update a session in place"""
+        slot, _ = self._parse(session_id)
+        if slot is None:
+            return contextlib.nullcontext()
+        return self.locks[slot % LOCKS]
+
+    def get(self, session_id):
+        """the session of an id, or None if there is no such session"""
+        slot, nonce = self._parse(session_id)
+        if slot is None:
+            return None
+        with self.locks[slot % LOCKS]:
+            stored, size, data = self.record.unpack_from(
+                self.buffer, slot * self.record.size
+            )
+        if stored != nonce or nonce == 0:
+            return None
+        try:
+            state = snapshot.GameState.unpack(data[:size], self.answers, self.all_words)
+        except ValueError:
+            return None
+        return Session(slot, nonce, state)
+
+    def save(self, session):
+        data = session.state.pack(self.answers, self.all_words)
+        with self.locks[session.slot % LOCKS]:
+            self.record.pack_into(
+                self.buffer,
+                session.slot * self.record.size,
+                session.nonce,
+                len(data),
+                data,
+            )
+
+    def _parse(self, session_id):
+        try:
+            slot, nonce = (int(part, 16) for part in session_id.split("-"))
+        except (AttributeError, ValueError):
+            return None, None
+        if not 0 <= slot < self.capacity:
+            return None, None
+        return slot, nonce
+
+
+class GameServer:
+    """the game rules and sessions, independent of the protocol"""
+
+    def __init__(self, length=words.DEFAULT_LENGTH, capacity=CAPACITY):
+        self.answers = words.load_answers(length)
+        self.all_words = words.load_all_words(length)
+        self.word_len = length
+        self.max_tries = length + 1
+        self.deck = deck.AnswerDeck(self.answers, seed=secrets.randbits(32))
+        self.sessions = SessionTable(
+            self.answers, self.all_words, capacity, self.max_tries
+        )
+
+    def new(self, code=None):
+        """start a game, a fresh one or the one in a game code"""
+        if code is None:
+            answer = self.answers.index(self.deck.draw())
+            state = snapshot.GameState(self.word_len, answer)
+        else:
+            try:
+                data = snapshot.from_share_code(str(code))
+                state = snapshot.GameState.unpack(data, self.answers, self.all_words)
+                restored = self.replay(state)
+            except (ValueError, game.InvalidGuess):
+                raise ApiError(400, "Invalid game code")
+            if restored.over:
+                raise ApiError(400, "Game already finished")
+            state.typed = ""
+        session = self.sessions.new(state)
+        return {
+            "session": session.id,
+            "word_len": self.word_len,
+            "max_tries": self.max_tries,
+        }
+
+    def replay(self, state):
+        """a Game with the guesses of a snapshot played"""
+        return state.to_game(self.answers, self.all_words, self.max_tries)
+
+    def guess(self, session_id, word):
+        # another worker may be guessing in the same session, the guess has
+        # to be checked against the state it is appended to
+        with self.sessions.locked(session_id):
+            session = self._session(session_id)
+            g = self.replay(session.state)
+            word = str(word).upper()
+            try:
+                pattern = g.guess(word)
+            except game.InvalidGuess as e:
+                raise ApiError(400, str(e))
+            session.state.guesses.append(self.all_words.index(word))
+            self.sessions.save(session)
+        return {"word": word, "pattern": pattern, **self._result(g)}
+
+    def state(self, session_id):
+        state = self._session(session_id).state
+        g = self.replay(state)
+        data = state.pack(self.answers, self.all_words)
+        return {
+            "guesses": [word for word, _ in g.history],
+            "patterns": [pattern for _, pattern in g.history],
+            **self._result(g),
+            "code": snapshot.share_code(data),
+        }
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ApiError(404, "Unknown session")
+        return session
+
+    def _result(self, g):
+        result = {"won": g.won, "over": g.over}
+        if g.over:
+            result["answer"] = g.answer
+        return result
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Handler:
+    """HTTP/1.1 with keep-alive and WebSocket upgrades over asyncio streams"""
+
+    def __init__(self, server):
+        self.server = server
+
+    async def __call__(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                upgrade = headers.get("upgrade", "").lower() == "websocket"
+                if upgrade and urlsplit(target).path == "/ws":
+                    await self.websocket(reader, writer, headers)
+                    break
+                status, payload = self.route(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ApiError as e:
+            writer.write(response(e.status, {"error": str(e)}, False))
+        finally:
+            writer.close()
+
+    def route(self, method, target, body):
+        url = urlsplit(target)
+        try:
+            if url.path == "/new" and method == "POST":
+                data = parse_json(body) if body else {}
+                return 200, self.server.new(data.get("code"))
+            if url.path == "/guess" and method == "POST":
+                data = parse_json(body)
+                return 200, self.server.guess(data.get("session"), data.get("word"))
+            if url.path == "/state" and method == "GET":
+                query = parse_qs(url.query)
+                return 200, self.server.state(query.get("session", [""])[0])
+            if url.path in ("/new", "/guess", "/state"):
+                raise ApiError(405, "Method Not Allowed")
+            raise ApiError(404, "Not Found")
+        except ApiError as e:
+            return e.status, {"error": str(e)}
+
+    async def websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key", "").encode()
+        accept = base64.b64encode(hashlib.sha1(key + WEBSOCKET_GUID).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        session_id = None
+        while True:
+            try:
+                opcode, payload = await read_frame(reader)
+            except ApiError:
+                writer.write(frame(0x8, struct.pack("!H", 1009)))
+                break
+            if opcode == 0x8:  # close
+                writer.write(frame(0x8, payload[:2]))
+                break
+            if opcode == 0x9:  # ping
+                writer.write(frame(0xA, payload))
+                continue
+            if opcode != 0x1:
+                continue
+
+            try:
+                message = parse_json(payload)
+                if message.get("type") == "new":
+                    reply = self.server.new(message.get("code"))
+                    session_id = reply["session"]
+                elif message.get("type") == "guess":
+                    reply = self.server.guess(session_id, message.get("word"))
+                else:
+                    raise ApiError(400, "Unknown message type")
+            except ApiError as e:
+                reply = {"error": str(e)}
+            writer.write(frame(0x1, json.dumps(reply).encode()))
+            await writer.drain()
+
+
+async def read_request(reader):
+    """(method, target, headers, body) of the next request, None at eof"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise ApiError(400, "Bad Request")
+        return None
+    except asyncio.LimitOverrunError:
+        raise ApiError(413, "Payload Too Large")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise ApiError(400, "Bad Request")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise ApiError(400, "Bad Request")
+    if length > MAX_BODY:
+        raise ApiError(413, "Payload Too Large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode()
+    return (
+        f"HTTP/1.1 {status} {STATUS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode() + body
+
+
+def parse_json(body):
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise ApiError(400, "Invalid JSON")
+    if not isinstance(data, dict):
+        raise ApiError(400, "Invalid JSON")
+    return data
+
+
+async def read_frame(reader):
+    """(opcode, payload) of the next websocket frame from a client"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if length > MAX_BODY:
+        raise ApiError(413, "Payload Too Large")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i & 3] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+def frame(opcode, payload, mask=None):
+    """a single websocket frame, clients have to mask theirs"""
+    head = bytes([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if len(payload) < 126:
+        head += bytes([mask_bit | len(payload)])
+    elif len(payload) < 1 << 16:
+        head += bytes([mask_bit | 126]) + struct.pack("!H", len(payload))
+    else:
+        head += bytes([mask_bit | 127]) + struct.pack("!Q", len(payload))
+    if mask:
+        payload = bytes(b ^ mask[i & 3] for i, b in enumerate(payload))
+        head += mask
+    return head + payload
+
+
+async def serve(sock, server):
+    async with await asyncio.start_server(Handler(server), sock=sock) as s:
+        await s.serve_forever()
+
+
+def run(host, port, workers=1, length=words.DEFAULT_LENGTH, capacity=CAPACITY):
+    """serve until interrupted, forking workers that share the socket and table"""
+    server = GameServer(length, capacity)
+    sock = socket.create_server((host, port))
+    print(f"serving on http://{host}:{port} with {workers} worker(s)")
+
+    children = []
+    worker = 0
+    if workers > 1 and hasattr(os, "fork"):
+        for i in range(1, workers):
+            pid = os.fork()
+            if pid == 0:
+                worker, children = i, []
+                break
+            children.append(pid)
+    else:
+        workers = 1
+    server.sessions.partition(worker, workers)
+    # forked workers would all draw the same answers from the parent's deck
+    server.deck = deck.AnswerDeck(server.answers, seed=secrets.randbits(32))
+
+    try:
+        asyncio.run(serve(sock, server))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="serve wordle over http")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-j", "--workers", type=int, default=1)
+    parser.add_argument(
+        "--length",
+        type=int,
+        default=words.DEFAULT_LENGTH,
+        choices=words.available_lengths(),
+    )
+    parser.add_argument(
+        "--capacity", type=int, default=CAPACITY, help="sessions kept at once"
+    )
+    args = parser.parse_args()
+    run(args.host, args.port, args.workers, args.length, args.capacity)
@@ -0,0 +1,144 @@
+"""
+Play lots of games without a window, to compare guessing strategies.
+
+    python simulate.py -n 10000 --strategy entropy -j 8
+
+A strategy is a factory that is called once per worker process and returns a
+function taking the game history (a list of (guess, pattern)) and a
+random.Random, and returning the next guess. Besides the built-in ones below
+any factory can be used as module:function.
+"""
+
+from collections import Counter
+from functools import lru_cache
+from multiprocessing import Pool
+
+import argparse
+import importlib
+import os
+import random
+import time
+
+import constraints
+import deck
+import game
+import words
+
+
+def random_strategy():
+    """guess a random word that could still be the answer"""
+    index = constraints.load_index(words.load_answers())
+
+    def guess(history, rng):
+        return index.words[rng.choice(index.indices(index.candidates(history)))]
+
+    return guess
+
+
+def entropy_strategy():
+    """guess whatever the solver ranks highest"""
+    import solver
+
+    s = solver.Solver()
+
+    # the best guess only depends on the history, so most games share them
+    @lru_cache(maxsize=65536)
+    def best_guess(history):
+        return s.best_guess(history)
+
+    def guess(history, rng):
+        return best_guess(tuple(history))
+
+    return guess
+
+
+STRATEGIES = {
+    "random": random_strategy,
+    "entropy": entropy_strategy,
+}
+
+
+def load_strategy(name):
+    """look up a strategy factory by name or module:function"""
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def play(answer, strategy, rng, max_tries=game.MAX_TRIES):
+    """play one game and return the number of guesses, or 0 if it was lost"""
+    g = game.Game(answer, words.ALL_WORDS, max_tries)
+    while not g.over:
+        g.guess(strategy(g.history, rng))
+    return len(g.history) if g.won else 0
+
+
+def _init_worker(strategy_name):
+    global _strategy
+    _strategy = load_strategy(strategy_name)()
+
+
+def _play_chunk(job):
+    seed, answers = job
+    rng = random.Random(seed)
+    return Counter(play(answer, _strategy, rng) for answer in answers)
+
+
+def simulate(n_games, strategy="random", processes=None, chunk_size=64, seed=None):
+    """play n_games and return a Counter of guess counts (0 for a loss)"""
+    answers = words.load_answers()
+    answer_deck = deck.AnswerDeck(answers, seed=seed)
+    drawn = [answer_deck.draw() for _ in range(n_games)]
+    jobs = [
+        (answer_deck.seed + start, drawn[start : start + chunk_size])
+        for start in range(0, n_games, chunk_size)
+    ]
+
+    results = Counter()
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        _init_worker(strategy)
+        for job in jobs:
+            results.update(_play_chunk(job))
+        return results
+
+    with Pool(processes, initializer=_init_worker, initargs=(strategy,)) as pool:
+        for counts in pool.imap_unordered(_play_chunk, jobs):
+            results.update(counts)
+    return results
+
+
+def report(results, elapsed, max_tries=game.MAX_TRIES):
+    """print a histogram of the guess counts and a summary"""
+    total = sum(results.values())
+    width = max(results.values())
+    for n in list(range(1, max_tries + 1)) + [0]:
+        count = results.get(n, 0)
+        bar = "#" * round(40 * count / width)
+        print(f"{n or 'X'}: {count:>7} {bar}")
+
+    wins = total - results.get(0, 0)
+    mean = sum(n * count for n, count in results.items()) / max(wins, 1)
+    print(
+        f"win rate {100 * wins / total:.2f}%, {mean:.3f} guesses per win, "
+        f"{total} games in {elapsed:.2f}s ({total / elapsed:.0f} games/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="play wordle without a window")
+    parser.add_argument("-n", "--games", type=int, default=1000)
+    parser.add_argument(
+        "-s", "--strategy", default="random", help="random, entropy or module:function"
+    )
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate(
+        args.games, args.strategy, args.processes, args.chunk_size, args.seed
+    )
+    report(results, time.perf_counter() - start)
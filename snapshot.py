@@ -0,0 +1,164 @@
+"""
+Packed game state, for saving a game on exit, sharing it and server sessions.
+
+A game is the index of its answer, the indices of its guesses in the list
+of valid words and the letters typed on the current row. Packed it is:
+
+    version, word length, wordlist checksum (2 bytes),
+    answer index, guess count, guess indices (varints), typed letters
+
+which is under 20 bytes for a game of 6 guesses. The checksum ties the
+indices to the wordlists they were taken from, a snapshot of different
+lists doesn't unpack. Share codes are the same bytes in url safe base64.
+"""
+
+from functools import lru_cache
+
+import base64
+import os
+import zlib
+
+import constraints
+import game
+import words
+
+VERSION = 1
+
+
+class GameState:
+    """a game as indices into its wordlists"""
+
+    __slots__ = ("word_len", "answer", "guesses", "typed")
+
+    def __init__(self, word_len, answer, guesses=(), typed=""):
+        self.word_len = word_len
+        self.answer = answer
+        self.guesses = list(guesses)
+        # letters typed on the current row that weren't checked yet
+        self.typed = typed
+
+    @classmethod
+    def from_game(cls, g, answers, all_words, typed=""):
+        return cls(
+            g.word_len,
+            answers.index(g.answer),
+            [all_words.index(word) for word, _ in g.history],
+            typed,
+        )
+
+    def to_game(self, answers, all_words, max_tries, hard=False):
+        """a Game with the guesses played, raises InvalidGuess if they don't fit"""
+        g = game.Game(answers[self.answer], all_words, max_tries)
+        for i in self.guesses:
+            g.guess(all_words[i])
+        if hard:
+            # the guesses so far may have been played without hard mode
+            g.hard = constraints.HardMode(all_words, g.history)
+        return g
+
+    def pack(self, answers, all_words):
+        data = bytearray([VERSION, self.word_len])
+        data += checksum(answers, all_words).to_bytes(2, "little")
+        data += varint(self.answer)
+        data += varint(len(self.guesses))
+        for i in self.guesses:
+            data += varint(i)
+        data += self.typed.encode("ascii")
+        return bytes(data)
+
+    @classmethod
+    def unpack(cls, data, answers, all_words):
+        """the state packed in data, raises ValueError if it isn't for these lists"""
+        if len(data) < 4 or data[0] != VERSION:
+            raise ValueError("unknown snapshot version")
+        if int.from_bytes(data[2:4], "little") != checksum(answers, all_words):
+            raise ValueError("snapshot of a different wordlist")
+        answer, pos = read_varint(data, 4)
+        count, pos = read_varint(data, pos)
+        guesses = []
+        for _ in range(count):
+            i, pos = read_varint(data, pos)
+            guesses.append(i)
+        typed = bytes(data[pos:]).decode("ascii")
+        if (
+            data[1] != len(answers[0])
+            or answer >= len(answers)
+            or any(i >= len(all_words) for i in guesses)
+            or len(typed) > data[1]
+        ):
+            raise ValueError("corrupt snapshot")
+        if typed and not (typed.isalpha() and typed.isupper()):
+            raise ValueError("corrupt snapshot")
+        return cls(data[1], answer, guesses, typed)
+
+
+@lru_cache(maxsize=words.SHARDS_CACHED)
+def checksum(answers, all_words):
+    """16 bit checksum of a pair of wordlists"""
+    crc = 0
+    for wordlist in (answers, all_words):
+        if hasattr(wordlist, "buffer"):
+            crc = zlib.crc32(wordlist.buffer, crc)
+        else:
+            crc = zlib.crc32("\n".join(wordlist).encode(), crc)
+    return crc & 0xFFFF
+
+
+def share_code(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def from_share_code(code):
+    """the bytes of a share code, raises ValueError if it isn't one"""
+    try:
+        return base64.urlsafe_b64decode(code + "=" * (-len(code) % 4))
+    except (TypeError, ValueError):
+        raise ValueError("not a game code")
+
+
+def state_path(length):
+    """where the unfinished game of a word length is saved"""
+    return words.DATA_DIR / f"game-{length}.bin"
+
+
+def save(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path):
+    """the saved bytes at path, None if there are none"""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def varint(n):
+    """n as a little endian base 128 varint"""
+    out = bytearray()
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+    return out
+
+
+def read_varint(data, pos):
+    """the varint at data[pos] and the position after it"""
+    n = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("truncated varint")
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
@@ -0,0 +1,167 @@
+"""
+Entropy based solver: ranks guesses by the expected information they give
+about the remaining answers.
+
+For every guess the remaining answers are bucketed by the pattern they would
+produce (one bincount over the whole guess x candidate block of the pattern
+matrix) and the guess is scored by the entropy of that distribution.
+
+    python solver.py                    # best opening guess
+    python solver.py CRANE:00120 ...    # best guess after some feedback
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+import constraints
+import patterns
+import scoring
+import words
+
+# rows of the pattern matrix bucketed at once, keeps the temporaries ~20 MB
+CHUNK_SIZE = 1024
+
+
+def entropies(matrix, guess_ids, candidates, n_patterns=243):
+    """entropy of the pattern distribution of each guess over the candidates"""
+    out = np.empty(len(guess_ids), dtype=np.float64)
+    offsets = np.arange(CHUNK_SIZE, dtype=np.int64)[:, None] * n_patterns
+    for start in range(0, len(guess_ids), CHUNK_SIZE):
+        rows = guess_ids[start : start + CHUNK_SIZE]
+        block = matrix[np.ix_(rows, candidates)]
+        codes = block + offsets[: len(rows)]
+        counts = np.bincount(codes.ravel(), minlength=len(rows) * n_patterns)
+        counts = counts.reshape(len(rows), n_patterns).astype(np.float64)
+        # H = log2(n) - sum(c * log2(c)) / n
+        logs = np.log2(counts, out=np.zeros_like(counts), where=counts > 0)
+        n = len(candidates)
+        out[start : start + len(rows)] = np.log2(n) - (counts * logs).sum(axis=1) / n
+    return out
+
+
+def _init_worker(length):
+    global _worker_matrix
+    _worker_matrix = patterns.load(length).matrix
+
+
+def _worker_entropies(args):
+    guess_ids, candidates, n_patterns = args
+    return entropies(_worker_matrix, guess_ids, candidates, n_patterns)
+
+
+class Solver:
+    """suggests guesses for a game given its feedback history"""
+
+    def __init__(
+        self,
+        pattern_matrix=None,
+        processes=None,
+        length=words.DEFAULT_LENGTH,
+        start_method=None,
+    ):
+        self.patterns = pattern_matrix or patterns.load(length)
+        self.processes = processes
+        # how the pool starts its processes, see multiprocessing.get_context
+        self.start_method = start_method
+        self.length = len(self.patterns.answers[0])
+        self.n_patterns = 3**self.length
+        self._pool = None
+        self._opener = None
+        # row of the pattern matrix for every answer
+        self._answer_rows = np.array(
+            [self.patterns.guess_index[word] for word in self.patterns.answers]
+        )
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def candidates(self, history):
+        """indices of the answers that are consistent with the history"""
+        index = constraints.load_index(self.patterns.answers)
+        bits = index.candidates(history)
+        return np.array(index.indices(bits), dtype=np.intp)
+
+    def rank(self, candidates, top=10, allowed=None):
+        """
+        the top guesses for the candidates as a list of (word, score), out of
+        the allowed words if given (hard mode) or every guess
+        """
+        if allowed is None:
+            guess_ids = np.arange(len(self.patterns.guesses))
+        else:
+            guess_ids = np.array(
+                [self.patterns.guess_index[word] for word in allowed], dtype=np.intp
+            )
+        scores = self._entropies(guess_ids, candidates)
+
+        # a guess that could be the answer also has a chance of winning outright
+        could_win = np.zeros(len(self.patterns.guesses), dtype=bool)
+        could_win[self._answer_rows[candidates]] = True
+        scores[could_win[guess_ids]] += 1 / len(candidates)
+
+        best = np.argsort(-scores, kind="stable")[:top]
+        return [(self.patterns.guesses[guess_ids[i]], float(scores[i])) for i in best]
+
+    def best_guess(self, history=(), allowed=None):
+        """
+        the best next guess, or None if no answer fits the history, out of
+        the allowed words if given
+        """
+        if not history and self._opener is not None:
+            return self._opener
+
+        candidates = self.candidates(history)
+        if len(candidates) == 0:
+            return None
+        if len(candidates) <= 2:
+            return self.patterns.answers[candidates[0]]
+
+        guess = self.rank(candidates, top=1, allowed=allowed)[0][0]
+        if not history:
+            self._opener = guess
+        return guess
+
+    def _entropies(self, guess_ids, candidates):
+        if not self.processes or self.processes < 2:
+            return entropies(
+                self.patterns.matrix, guess_ids, candidates, self.n_patterns
+            )
+
+        if self._pool is None:
+            context = multiprocessing.get_context(self.start_method)
+            self._pool = context.Pool(
+                self.processes, initializer=_init_worker, initargs=(self.length,)
+            )
+        chunks = np.array_split(guess_ids, self.processes)
+        jobs = [(chunk, candidates, self.n_patterns) for chunk in chunks]
+        return np.concatenate(self._pool.map(_worker_entropies, jobs))
+
+
+def parse_feedback(text):
+    """parse 'CRANE:00120' (digits are per letter, 2 = correct) into a tuple"""
+    word, digits = text.split(":")
+    return word.upper(), scoring.encode([int(d) for d in digits])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="suggest the next guess")
+    parser.add_argument("history", nargs="*", type=parse_feedback)
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("-n", "--top", type=int, default=10)
+    args = parser.parse_args()
+
+    solver = Solver(processes=args.processes)
+    start = time.perf_counter()
+    candidates = solver.candidates(args.history)
+    ranking = solver.rank(candidates, top=args.top) if len(candidates) else []
+    elapsed = time.perf_counter() - start
+    solver.close()
+
+    print(f"{len(candidates)} candidates left, ranked in {elapsed * 1000:.0f} ms")
+    for word, score in ranking:
+        print(f"{word} {score:.3f}")
@@ -0,0 +1,220 @@
+"""
+Game statistics.
+
+Every finished game is appended as one JSON line to a log, which is never
+rewritten, so a crash can at worst lose the line being written. The totals
+the stats screen shows (games played, wins, streaks, guess distribution) are
+kept in a snapshot next to the log that is updated with every game and
+remembers how far into the log it got. Opening the stats reads the snapshot
+and replays only the games logged after it, so it takes the same time with
+ten games or a hundred thousand.
+
+Writing happens on a background thread, recording a game from the ui only
+updates the totals in memory and queues the line. The writer takes the log
+as it finds it: another instance of the game may have added games too, so
+the snapshot is caught up with the log on disk after every append, not
+written from the totals in memory.
+
+    python stats.py [--rebuild]
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import words
+
+SNAPSHOT_VERSION = 1
+
+
+def empty_totals():
+    return {
+        "played": 0,
+        "won": 0,
+        "streak": 0,
+        "max_streak": 0,
+        "distribution": {},
+        "seconds": 0.0,
+    }
+
+
+def apply(totals, record):
+    """add one finished game to the totals of its word length"""
+    t = totals.setdefault(str(len(record["answer"])), empty_totals())
+    t["played"] += 1
+    t["seconds"] += record["seconds"]
+    if record["won"]:
+        tries = str(len(record["guesses"]))
+        t["won"] += 1
+        t["streak"] += 1
+        t["max_streak"] = max(t["max_streak"], t["streak"])
+        t["distribution"][tries] = t["distribution"].get(tries, 0) + 1
+    else:
+        t["streak"] = 0
+
+
+class Stats:
+    """the recorded games of a player and their running totals"""
+
+    def __init__(self, directory=None):
+        directory = words.DATA_DIR if directory is None else directory
+        self.log_path = directory / "games.log"
+        self.snapshot_path = directory / "stats.json"
+        self.totals = {}
+        # where the last complete line the totals count ends
+        self.offset = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        self.load()
+
+    def load(self):
+        """read the snapshot and catch up with the games logged after it"""
+        self.totals, self.offset = self.read()
+
+    def read(self):
+        """the totals and offset of the snapshot, caught up with the log"""
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            snapshot = {}
+
+        totals, offset = {}, 0
+        if snapshot.get("version") == SNAPSHOT_VERSION:
+            totals, offset = snapshot["totals"], snapshot["offset"]
+        try:
+            size = self.log_path.stat().st_size
+        except OSError:
+            size = 0
+        if offset > size:
+            # the log was replaced or cut short, count it all again
+            totals, offset = {}, 0
+        for record, offset in self.replay(offset):
+            apply(totals, record)
+        return totals, offset
+
+    def replay(self, offset=0):
+        """
+        the games logged from offset on as (record, offset after it),
+        stopping at a torn last line
+        """
+        try:
+            f = open(self.log_path, "rb")
+        except OSError:
+            return
+        with f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                offset += len(line)
+                yield record, offset
+
+    def record(self, answer, guesses, won, seconds):
+        """count a finished game and queue it to be written"""
+        record = {
+            "time": round(time.time()),
+            "answer": answer,
+            "guesses": list(guesses),
+            "won": won,
+            "seconds": round(seconds, 2),
+        }
+        apply(self.totals, record)
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        self.offset += len(line)
+
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        self._queue.put(line)
+
+    def for_length(self, length):
+        """the totals of games of a word length"""
+        return self.totals.get(str(length), empty_totals())
+
+    def close(self):
+        """wait for the queued games to be written"""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _write_loop(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                return
+            self._append(line)
+            totals, offset = self.read()
+            self._save_snapshot(
+                {"version": SNAPSHOT_VERSION, "offset": offset, "totals": totals}
+            )
+
+    def _append(self, line):
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            complete = last_line_end(f, end)
+            if complete != end:
+                # drop a line torn by a crash before adding ours
+                f.truncate(complete)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _save_snapshot(self, snapshot):
+        tmp = self.snapshot_path.with_name(f"{self.snapshot_path.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+
+
+def last_line_end(f, end, chunk_size=4096):
+    """where the last line ending in a newline ends, reading back from end"""
+    pos = end
+    while pos > 0:
+        start = max(0, pos - chunk_size)
+        f.seek(start)
+        i = f.read(pos - start).rfind(b"\n")
+        if i >= 0:
+            return start + i + 1
+        pos = start
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="show the recorded statistics")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recount the totals from the log"
+    )
+    args = parser.parse_args()
+
+    stats = Stats()
+    if args.rebuild:
+        stats.totals, stats.offset = {}, 0
+        for record, stats.offset in stats.replay():
+            apply(stats.totals, record)
+        stats._save_snapshot(
+            {
+                "version": SNAPSHOT_VERSION,
+                "offset": stats.offset,
+                "totals": stats.totals,
+            }
+        )
+    for length, t in sorted(stats.totals.items()):
+        rate = 100 * t["won"] / t["played"] if t["played"] else 0
+        print(
+            f"{length} letters: {t['played']} played, {rate:.0f}% won, "
+            f"streak {t['streak']} (max {t['max_streak']})"
+        )
+        for tries, n in sorted(t["distribution"].items(), key=lambda x: int(x[0])):
+            print(f"  {tries}: {n}")
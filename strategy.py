@@ -0,0 +1,243 @@
+"""
+A precomputed strategy for the answers: which word to guess next for every
+feedback history, so a hint is a few array lookups instead of a search.
+
+    python strategy.py [--length 5] [-j N] [--rebuild]
+
+The tree is built offline by the entropy solver: the best opener is picked
+once, the answers are split by the pattern it gives them, and every bucket
+is solved recursively, the buckets of the opener spread across processes.
+Each guess is the solver's choice for its bucket, so the tree plays like the
+hint does, it is not searched for the fewest guesses overall.
+
+The tree is saved flat, with its nodes in breadth first order:
+
+    header    b"PWTR", version, word length, node count, edge count
+    guess     int32 per node, index of the word to guess in all the words
+    first     int32 per node + 1, where the node's edges start
+    pattern   uint16 per edge, sorted within a node
+    child     int32 per edge, the node to go to on that pattern
+
+and read through a mmap, so loading it costs nothing and the lookups don't
+need numpy. The file name has the crc32 of the wordlists it was built from,
+taken from the mapped shards so finding it doesn't read the files again.
+"""
+
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from multiprocessing import Pool
+
+import argparse
+import mmap
+import os
+import struct
+import time
+import zlib
+
+import words
+
+MAGIC = b"PWTR"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2xII")
+
+
+class Strategy:
+    """a saved strategy tree, mmapped"""
+
+    def __init__(self, path, guesses):
+        self.path = path
+        self.guesses = guesses
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size or HEADER.unpack_from(self._mmap)[:2] != (
+            MAGIC,
+            VERSION,
+        ):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a strategy file")
+        _, _, self.word_len, nodes, edges = HEADER.unpack_from(self._mmap)
+
+        data = memoryview(self._mmap)
+        pos = HEADER.size
+        self.guess = data[pos : pos + 4 * nodes].cast("i")
+        pos += 4 * nodes
+        self.first = data[pos : pos + 4 * (nodes + 1)].cast("i")
+        pos += 4 * (nodes + 1)
+        self.pattern = data[pos : pos + 2 * edges].cast("H")
+        pos += 2 * edges
+        self.child = data[pos : pos + 4 * edges].cast("i")
+
+    def node(self, history):
+        """the node a history of (guess, pattern) leads to, None if it left the tree"""
+        node = 0
+        for word, pattern in history:
+            if self.guesses[self.guess[node]] != word:
+                return None
+            start, end = self.first[node], self.first[node + 1]
+            i = bisect_left(self.pattern, pattern, start, end)
+            if i == end or self.pattern[i] != pattern:
+                return None
+            node = self.child[i]
+        return node
+
+    def hint(self, history=()):
+        """the next guess of the strategy, None if the game left it"""
+        node = self.node(history)
+        return None if node is None else self.guesses[self.guess[node]]
+
+    def close(self):
+        self.guess.release()
+        self.first.release()
+        self.pattern.release()
+        self.child.release()
+        self._mmap.close()
+
+
+def strategy_path(length=words.DEFAULT_LENGTH):
+    """the strategy file of the current wordlists of a length"""
+    crc = 0
+    for wordlist in (words.load_all_words(length), words.load_answers(length)):
+        crc = zlib.crc32(wordlist.buffer, crc)
+    return words.CACHE_DIR / f"strategy-v{VERSION}-{length}-{crc:08x}.bin"
+
+
+def load(length=words.DEFAULT_LENGTH):
+    """the strategy for a length, None if it wasn't built"""
+    # checked on every call so a tree built after a miss is picked up
+    path = strategy_path(length)
+    if not path.exists():
+        return None
+    return _load(path, length)
+
+
+@lru_cache(maxsize=2)
+def _load(path, length):
+    return Strategy(path, words.load_all_words(length))
+
+
+def solve(solver, candidates):
+    """the subtree for some answers, as (guess index, [(pattern, subtree)])"""
+    import numpy as np
+
+    if len(candidates) <= 2:
+        word = solver.patterns.answers[candidates[0]]
+    else:
+        word = solver.rank(candidates, top=1)[0][0]
+    guess = solver.patterns.guess_index[word]
+
+    row = np.asarray(solver.patterns.matrix[guess, candidates])
+    solved = 3**solver.length - 1
+    children = []
+    for pattern in np.unique(row):
+        if pattern != solved:
+            children.append((int(pattern), solve(solver, candidates[row == pattern])))
+    return guess, children
+
+
+def _init_worker(length):
+    global _worker_solver
+    import solver
+
+    _worker_solver = solver.Solver(length=length)
+
+
+def _solve_bucket(candidates):
+    return solve(_worker_solver, candidates)
+
+
+def build(length=words.DEFAULT_LENGTH, processes=None):
+    """solve every answer and return the tree, the opener's buckets in parallel"""
+    import numpy as np
+
+    import solver
+
+    root_solver = solver.Solver(length=length)
+    candidates = np.arange(len(root_solver.patterns.answers))
+    opener = root_solver.patterns.guess_index[root_solver.best_guess()]
+    row = np.asarray(root_solver.patterns.matrix[opener, candidates])
+    solved = 3**length - 1
+    codes = [int(p) for p in np.unique(row) if p != solved]
+    buckets = [candidates[row == p] for p in codes]
+
+    if processes is None or processes > 1:
+        with Pool(processes, initializer=_init_worker, initargs=(length,)) as pool:
+            subtrees = pool.map(_solve_bucket, buckets, chunksize=1)
+    else:
+        subtrees = [solve(root_solver, bucket) for bucket in buckets]
+    return opener, list(zip(codes, subtrees))
+
+
+def save(path, tree, length):
+    """write a tree in breadth first order as flat arrays"""
+    guess = []
+    first = [0]
+    edge_patterns = []
+    edge_children = []
+    queue = deque([tree])
+    while queue:
+        node, children = queue.popleft()
+        guess.append(node)
+        for pattern, child in sorted(children):
+            edge_patterns.append(pattern)
+            # ids are handed out in the order nodes are queued
+            edge_children.append(len(guess) + len(queue))
+            queue.append(child)
+        first.append(len(edge_patterns))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, length, len(guess), len(edge_patterns)))
+        f.write(struct.pack(f"<{len(guess)}i", *guess))
+        f.write(struct.pack(f"<{len(first)}i", *first))
+        f.write(struct.pack(f"<{len(edge_patterns)}H", *edge_patterns))
+        f.write(struct.pack(f"<{len(edge_children)}i", *edge_children))
+    os.replace(tmp, path)
+
+    # drop strategies of older wordlists
+    for old in path.parent.glob(f"strategy-v*-{length}-*.bin"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def evaluate(strategy, pattern_matrix):
+    """the number of guesses the strategy takes for every answer"""
+    counts = []
+    for answer in pattern_matrix.answers:
+        history = []
+        while True:
+            guess = strategy.hint(history)
+            if guess is None:
+                raise ValueError(f"the strategy doesn't solve {answer}")
+            history.append((guess, pattern_matrix.pattern(guess, answer)))
+            if guess == answer:
+                break
+        counts.append(len(history))
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="build the hint strategy tree")
+    parser.add_argument("--length", type=int, default=words.DEFAULT_LENGTH)
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("--rebuild", action="store_true", help="ignore the saved tree")
+    args = parser.parse_args()
+
+    path = strategy_path(args.length)
+    if args.rebuild or not path.exists():
+        start = time.perf_counter()
+        tree = build(args.length, args.processes)
+        save(path, tree, args.length)
+        print(f"built {path} in {time.perf_counter() - start:.1f}s")
+    _load.cache_clear()
+    strategy = load(args.length)
+
+    import patterns
+
+    counts = evaluate(strategy, patterns.load(args.length))
+    print(f"{len(strategy.guess)} nodes, {os.path.getsize(path)} bytes")
+    print(f"average guesses: {sum(counts) / len(counts):.3f}")
+    print(f"worst case:      {max(counts)}")
+    for n in range(1, max(counts) + 1):
+        print(f"  {n}: {counts.count(n)}")
@@ -0,0 +1,122 @@
+"""
+Background work for the ui.
+
+Tk is single threaded, anything slow done in an event handler freezes the
+window until it is done. Tasks runs functions on a worker thread and hands
+their results back on the Tk thread: workers put results on a queue which
+is polled with after() while there is work in flight, and the callback of
+each task is called from there.
+
+The workers are threads, they share the GIL with Tk. They keep the window
+responsive while waiting on files or on other processes, and for short work
+like counting the remaining answers, but anything CPU bound that takes long
+has to be handed to processes by the task itself, as the hint does with the
+solver's pool.
+
+Cancelling a task drops it if it hasn't started yet and discards its result
+if it has, a callback never runs for a cancelled task. The game cancels
+everything when a new game starts so analysis of the old board can't land
+on the new one.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import queue
+
+# how often to check for finished tasks, in milliseconds
+POLL_INTERVAL = 20
+
+
+class Task:
+    """a function call submitted to Tasks"""
+
+    def __init__(self, func, args, callback, errback):
+        self.func = func
+        self.args = args
+        self.callback = callback
+        self.errback = errback
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class Tasks:
+    """runs functions on background threads and calls back on the tk thread"""
+
+    def __init__(self, root, workers=1, poll_interval=POLL_INTERVAL):
+        self.root = root
+        self.poll_interval = poll_interval
+        # one worker by default, so tasks run in the order they were submitted
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pywordle-task"
+        )
+        self._results = queue.Queue()
+        self._pending = set()
+        self._scheduled = None
+
+    def submit(self, func, *args, callback=None, errback=None):
+        """
+        run func(*args) in the background, then callback(result) or
+        errback(exception) on the tk thread
+        """
+        task = Task(func, args, callback, errback)
+        task.future = self._executor.submit(self._run, task)
+        self._pending.add(task)
+        if self._scheduled is None:
+            self._scheduled = self.root.after(self.poll_interval, self._poll)
+        return task
+
+    def _run(self, task):
+        if task.cancelled:
+            return
+        try:
+            self._results.put((task, task.func(*task.args), None))
+        except Exception as e:
+            self._results.put((task, None, e))
+
+    def _poll(self):
+        self._scheduled = None
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(task)
+            if task.cancelled:
+                continue
+            if error is None:
+                if task.callback is not None:
+                    task.callback(result)
+            elif task.errback is not None:
+                task.errback(error)
+            else:
+                self.root.report_callback_exception(
+                    type(error), error, error.__traceback__
+                )
+
+        # a task cancelled before it started never reports back
+        self._pending = {task for task in self._pending if not task.cancelled}
+        if self._pending:
+            self._scheduled = self.root.after(self.poll_interval, self._poll)
+
+    def cancel_all(self):
+        """cancel every task that hasn't called back yet"""
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+
+    def shutdown(self, wait=False):
+        """
+        stop the workers, cancelling everything without waiting for them,
+        or with wait letting the submitted tasks finish first (no callbacks)
+        """
+        if not wait:
+            self.cancel_all()
+        if self._scheduled is not None:
+            self.root.after_cancel(self._scheduled)
+            self._scheduled = None
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
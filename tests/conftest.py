@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# the modules live at the top of the repo and find the wordlists relative to
+# the working directory, caches and saved state go to a throwaway directory
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+os.environ["PYWORDLE_HOME"] = tempfile.mkdtemp(prefix="pywordle-tests-")
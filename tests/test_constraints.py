@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+import constraints
+import scoring
+import words
+
+
+@pytest.fixture(scope="module")
+def answers():
+    return words.load_answers()
+
+
+def brute_force(wordlist, history):
+    return [
+        word
+        for word in wordlist
+        if all(scoring.score(guess, word) == pattern for guess, pattern in history)
+    ]
+
+
+def test_candidates_match_brute_force(answers):
+    index = constraints.load_index(answers)
+    all_words = list(words.load_all_words())
+    rng = random.Random(0)
+    for _ in range(40):
+        answer = rng.choice(answers)
+        history = []
+        for guess in rng.sample(all_words, rng.randint(1, 3)):
+            history.append((guess, scoring.score(guess, answer)))
+        bits = index.candidates(history)
+        expected = brute_force(answers, history)
+        assert index.select(bits) == expected
+        assert [answers[i] for i in index.indices(bits)] == expected
+        assert constraints.count(bits) == len(expected)
+
+
+def test_select_of_nothing_and_everything(answers):
+    index = constraints.load_index(answers)
+    assert index.select(0) == []
+    assert index.select(index.all) == list(answers)
+
+
+def test_hard_mode_violations():
+    hard = constraints.HardMode(words.load_all_words())
+    hard.add("SLATE", scoring.encode([0, 0, 2, 0, 1]))
+    assert hard.violation("CRANE") is None
+    assert hard.violation("SLOTH") == "3rd letter must be A"
+    assert hard.violation("BRAID") == "Guess must contain E"
+
+    hard.add("GEESE", scoring.encode([0, 2, 1, 0, 0]))
+    assert hard.violation("BLAZE") == "2nd letter must be E"
+    assert hard.violation("REACH") == "Guess must contain E 2 times"
+    assert hard.violation("EEAEE") is None
+
+
+def test_hard_mode_allowed_matches_violation():
+    all_words = words.load_all_words()
+    hard = constraints.HardMode(all_words)
+    assert hard.allowed() == list(all_words)
+    hard.add("CRANE", scoring.score("CRANE", "TRACE"))
+    expected = [word for word in all_words if hard.violation(word) is None]
+    assert hard.allowed() == expected
+    assert "TRACE" in expected and "SLOTH" not in expected
+
+
+def test_indexes_are_cached_like_the_shards():
+    import search
+    import snapshot
+
+    size = words.load_shard.cache_info().maxsize
+    for cached in (constraints.load_index, search.load_index, snapshot.checksum):
+        assert cached.cache_info().maxsize == size
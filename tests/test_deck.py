@@ -0,0 +1,46 @@
+import os
+
+import deck
+import words
+
+
+def test_fingerprint_of_a_packed_wordlist(tmp_path):
+    path = tmp_path / "answers.bin"
+    words.write_packed(path, ["CRANE", "SLATE", "TRACE"])
+    packed = words.PackedWordlist(path)
+    lazy = words.LazyWordlist(lambda: packed)
+    assert deck.fingerprint(packed) == deck.fingerprint(lazy)
+
+    before = deck.fingerprint(packed)
+    words.write_packed(path, ["CRANE", "SLATE", "TRACE", "TRICE"])
+    assert deck.fingerprint(words.PackedWordlist(path)) != before
+
+
+def test_saved_deck_resumes_until_the_answers_change(tmp_path):
+    path = tmp_path / "answers.bin"
+    words.write_packed(path, ["CRANE", "SLATE", "TRACE"])
+    state = tmp_path / "deck.json"
+
+    first = deck.AnswerDeck(words.PackedWordlist(path), state_path=state)
+    drawn = [first.draw(), first.draw()]
+    second = deck.AnswerDeck(words.PackedWordlist(path), state_path=state)
+    assert second.seed == first.seed and second.cursor == 2
+    assert {second.draw()} | set(drawn) == {"CRANE", "SLATE", "TRACE"}
+
+    # the same words written again, as a checkout or a rebuild does
+    words.write_packed(path, ["CRANE", "SLATE", "TRACE"])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    third = deck.AnswerDeck(words.PackedWordlist(path), state_path=state)
+    assert third.cursor == 3
+
+    words.write_packed(path, ["CRANE", "SLATE", "TRICE"])
+    fourth = deck.AnswerDeck(words.PackedWordlist(path), state_path=state)
+    assert fourth.cursor == 0
+
+
+def test_seeded_decks_repeat():
+    answers = ["CRANE", "SLATE", "TRACE", "TRICE"]
+    a = deck.AnswerDeck(answers, seed=7)
+    b = deck.AnswerDeck(answers, seed=7)
+    assert [a.draw() for _ in range(8)] == [b.draw() for _ in range(8)]
@@ -0,0 +1,60 @@
+import pytest
+
+import game
+import scoring
+import words
+
+
+def test_game_plays_to_a_win():
+    g = game.Game("CRANE", words.load_all_words())
+    g.guess("SLATE")
+    assert g.guess("CRANE") == scoring.solved_pattern(5)
+    assert g.won and g.over
+    with pytest.raises(game.InvalidGuess, match="Game Over"):
+        g.guess("SLATE")
+
+
+def test_invalid_guesses():
+    g = game.Game("CRANE", words.load_all_words())
+    with pytest.raises(game.InvalidGuess, match="Not Enough Letters"):
+        g.guess("CRA")
+    with pytest.raises(game.InvalidGuess, match="Not in word list"):
+        g.guess("XXXXX")
+    assert g.history == []
+
+
+def test_hard_mode_rejects_guesses_ignoring_hints():
+    g = game.Game("CRANE", words.load_all_words(), hard=True)
+    g.guess("SLATE")
+    with pytest.raises(game.InvalidGuess, match="3rd letter must be A"):
+        g.guess("SLOTH")
+    assert len(g.history) == 1
+    g.guess("TRACE")
+    assert "CRANE" in g.allowed() and "TRACE" in g.allowed()
+
+
+def test_absurd_game_keeps_the_largest_bucket():
+    pytest.importorskip("numpy")
+    answers = ["AAAAB", "AAAAC", "AAAAD", "BBBBB"]
+    valid = answers + ["AAAAE"]
+    g = game.AbsurdGame(answers, valid)
+
+    # three answers share a pattern, BBBBB is dropped
+    assert scoring.decode(g.guess("AAAAE")) == (2, 2, 2, 2, 0)
+    assert [bytes(row).decode() for row in g.remaining] == answers[:3]
+    # a tie of single answers goes to the lowest pattern, not the win
+    assert g.guess("AAAAB") != scoring.solved_pattern(5)
+    assert not g.won
+
+
+def test_absurd_game_on_the_real_answers():
+    pytest.importorskip("numpy")
+    answers = words.load_answers()
+    g = game.AbsurdGame(answers, words.load_all_words())
+    for guess in ("CRANE", "SLOTH", "PUDGY"):
+        pattern = g.guess(guess)
+        remaining = [bytes(row).decode() for row in g.remaining]
+        assert all(scoring.score(guess, a) == pattern for a in remaining)
+    while not g.won:
+        g.guess(g.answer)
+    assert g.answer == g.history[-1][0]
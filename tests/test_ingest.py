@@ -0,0 +1,32 @@
+import ingest
+import words
+
+
+def test_reimport_replaces_the_cached_wordlist(tmp_path, monkeypatch):
+    monkeypatch.setattr(words, "CUSTOM_DIR", tmp_path / "wordlists")
+    source = tmp_path / "mine.txt"
+
+    source.write_text("apple\nberry\n")
+    assert ingest.ingest(source, "mine") == {5: 2}
+    first = words.load_all_words(5, "mine")
+    assert list(first) == ["APPLE", "BERRY"]
+
+    source.write_text("apple\nberry\ncherry\nmango\n")
+    assert ingest.ingest(source, "mine") == {5: 3, 6: 1}
+    assert list(words.load_all_words(5, "mine")) == ["APPLE", "BERRY", "MANGO"]
+    # the old version stays readable for whoever still has it open
+    assert list(first) == ["APPLE", "BERRY"]
+    assert words.custom_wordlists() == {"mine": [5, 6]}
+
+
+def test_reimporting_the_same_words_keeps_the_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(words, "CUSTOM_DIR", tmp_path / "wordlists")
+    source = tmp_path / "mine.txt"
+    source.write_text("apple\nberry\n")
+
+    ingest.ingest(source, "mine")
+    path = words.custom_path("mine", 5)
+    ingest.ingest(source, "mine")
+
+    assert words.custom_path("mine", 5) == path
+    assert len(list((tmp_path / "wordlists").iterdir())) == 1
@@ -0,0 +1,107 @@
+import recordings
+import words
+
+
+def test_record_round_trip(tmp_path):
+    path = tmp_path / "games.rec"
+    recorder = recordings.Recorder(path=path)
+    answers = words.load_answers()
+    keys = [("C", 0.0), ("BACKSPACE", 0.25), ("R", 1.5), ("ENTER", 3.5)]
+    recorder.record(1700000000, 12.5, answers[3], ["CRANE", answers[3]], keys)
+    recorder.record(1700000100, 4.0, answers[7], [answers[7]])
+
+    with_keys = list(recordings.read_records(path, keys=True))
+    without_keys = list(recordings.read_records(path))
+    for records in (with_keys, without_keys):
+        assert [r.started for r in records] == [1700000000, 1700000100]
+        assert [r.ms for r in records] == [12500, 4000]
+        assert [r.answer for r in records] == [3, 7]
+        assert records[0].guesses == [
+            words.load_all_words().index("CRANE"),
+            words.load_all_words().index(answers[3]),
+        ]
+    assert with_keys[0].keys == [
+        (2, 0),
+        (recordings.KEY_BACKSPACE, 250),
+        (17, 1250),
+        (recordings.KEY_ENTER, 2000),
+    ]
+    assert with_keys[1].keys == []
+    assert without_keys[0].keys == ()
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    path = tmp_path / "games.rec"
+    recorder = recordings.Recorder(path=path)
+    answers = words.load_answers()
+    recorder.record(1700000000, 1.0, answers[0], [answers[0]])
+    with open(path, "ab") as f:
+        f.write(b"\x40\x01\x02")
+
+    assert [r.answer for r in recordings.read_records(path)] == [0]
+
+
+def test_analytics():
+    answers = words.load_answers()
+    all_words = words.load_all_words()
+    analytics = recordings.Analytics(answers, all_words, 6)
+    won = recordings.Record(0, 1000, 0, [all_words.index(answers[0])])
+    lost = recordings.Record(0, 3000, 1, [all_words.index(answers[0])] * 6)
+    for record in (won, lost):
+        analytics.add(record)
+
+    assert analytics.games == 2
+    assert analytics.ms == 4000
+    assert analytics.hardest(1) == [(answers[1], 7.0)]
+    assert analytics.common_openers(1) == [(answers[0], 2)]
+
+
+def test_append_cuts_a_torn_tail(tmp_path):
+    path = tmp_path / "games.rec"
+    answers = words.load_answers()
+    recordings.Recorder(path=path).record(1700000000, 1.0, answers[0], [answers[0]])
+    with open(path, "ab") as f:
+        f.write(b"\x40\x01\x02")
+
+    # a new run finds where the complete records end
+    recorder = recordings.Recorder(path=path)
+    recorder.record(1700000100, 2.0, answers[1], [answers[1]])
+    recorder.record(1700000200, 3.0, answers[2], [answers[2]])
+
+    assert [r.answer for r in recordings.read_records(path)] == [0, 1, 2]
+    assert recordings.valid_end(path) == path.stat().st_size
+
+
+def test_valid_end_of_a_missing_file(tmp_path):
+    assert recordings.valid_end(tmp_path / "missing.rec") == 0
+
+
+def test_two_recorders_keep_every_record(tmp_path):
+    path = tmp_path / "games.rec"
+    answers = words.load_answers()
+    first = recordings.Recorder(path=path)
+    second = recordings.Recorder(path=path)
+    first.record(1700000000, 1.0, answers[0], [answers[0]])
+    second.record(1700000100, 2.0, answers[1], [answers[1]])
+    first.record(1700000200, 3.0, answers[2], [answers[2]])
+
+    assert [r.answer for r in recordings.read_records(path)] == [0, 1, 2]
+
+
+def test_scan_stops_at_a_corrupt_size(tmp_path):
+    path = tmp_path / "games.rec"
+    answers = words.load_answers()
+    recordings.Recorder(path=path).record(1700000000, 1.0, answers[0], [answers[0]])
+    end = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b"\xff\xff\xff\xff" + bytes(1 << 16))
+
+    reads = []
+    with open(path, "rb") as f:
+        read = f.read
+        f.read = lambda n=-1: reads.append(n) or read(n)
+        assert recordings._read_header(f)
+        ends = [e for _, _, e in recordings._scan(f, 64)]
+    assert ends == [end]
+    assert len(reads) <= 2
+    assert recordings.valid_end(path) == end
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+import scoring
+import words
+
+np = pytest.importorskip("numpy")
+
+
+def random_words(rng, length, count, letters="ABCDE"):
+    # few letters, so repeated letters and partial matches are common
+    return ["".join(rng.choices(letters, k=length)) for _ in range(count)]
+
+
+@pytest.mark.parametrize(
+    "guess, answer, digits",
+    [
+        ("CRANE", "CRANE", (2, 2, 2, 2, 2)),
+        ("SPEED", "ABIDE", (0, 0, 1, 0, 1)),
+        ("SPEED", "ERASE", (1, 0, 1, 1, 0)),
+        ("LLAMA", "HELLO", (1, 1, 0, 0, 0)),
+        ("EERIE", "GEESE", (1, 2, 0, 0, 2)),
+    ],
+)
+def test_score(guess, answer, digits):
+    assert scoring.decode(scoring.score(guess, answer)) == digits
+
+
+@pytest.mark.parametrize("length", [4, 5, 6, 8])
+def test_score_batch_matches_score(length):
+    rng = random.Random(length)
+    answers = random_words(rng, length, 500)
+    for guess in random_words(rng, length, 30):
+        expected = [scoring.score(guess, answer) for answer in answers]
+        assert scoring.score_batch(guess, answers).tolist() == expected
+
+
+@pytest.mark.parametrize("length", [4, 5, 6, 8])
+def test_score_matrix_matches_score(length):
+    rng = random.Random(length)
+    guesses = random_words(rng, length, 40)
+    answers = random_words(rng, length, 60)
+    matrix = scoring.score_matrix(guesses, answers, chunk_size=7)
+    expected = [[scoring.score(g, a) for a in answers] for g in guesses]
+    assert matrix.tolist() == expected
+
+
+def test_score_batch_on_packed_wordlists():
+    answers = words.load_answers()
+    batch = scoring.score_batch("SOARE", answers)
+    assert batch.dtype == scoring.pattern_dtype(5)
+    assert batch.tolist() == [scoring.score("SOARE", a) for a in answers]
+    assert scoring.score_batch("SOARE", []).shape == (0,)
+
+
+def test_score_many_on_both_sides_of_the_threshold():
+    answers = list(words.load_answers())[: scoring.BATCH_THRESHOLD * 2]
+    for n in (3, scoring.BATCH_THRESHOLD, len(answers)):
+        expected = [scoring.score("CRANE", a) for a in answers[:n]]
+        assert scoring.score_many("CRANE", answers[:n]) == expected
+
+
+def test_largest_bucket():
+    answers = ["AAAAB", "AAAAC", "AAAAD", "BBBBB"]
+    pattern, keep = scoring.largest_bucket("AAAAE", answers)
+    assert scoring.decode(pattern) == (2, 2, 2, 2, 0)
+    assert keep.tolist() == [True, True, True, False]
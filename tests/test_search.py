@@ -0,0 +1,59 @@
+import random
+import re
+import string
+
+import pytest
+
+import search
+import words
+
+
+@pytest.fixture(scope="module")
+def all_words():
+    return list(words.load_all_words())
+
+
+def regex_scan(wordlist, pattern, include, exclude):
+    regex = re.compile(pattern.replace("?", "."))
+    return [
+        word
+        for word in wordlist
+        if regex.fullmatch(word)
+        and all(c in word for c in include)
+        and not any(c in word for c in exclude)
+    ]
+
+
+def test_matches_a_regex_scan(all_words):
+    index = search.SearchIndex(all_words)
+    rng = random.Random(0)
+    for _ in range(200):
+        pattern = "".join(
+            rng.choice("?" * 4 + string.ascii_uppercase) for _ in range(5)
+        )
+        include = "".join(rng.sample(string.ascii_uppercase, rng.randint(0, 2)))
+        exclude = "".join(rng.sample(string.ascii_uppercase, rng.randint(0, 3)))
+        expected = regex_scan(all_words, pattern, include, exclude)
+        assert list(index.search(pattern, include, exclude)) == expected
+
+
+def test_pages(all_words):
+    index = search.SearchIndex(all_words)
+    first, rest = index.page("s????", size=10)
+    assert first + list(rest) == regex_scan(all_words, "S????", "", "")
+    assert len(first) == 10
+
+
+def test_bad_patterns(all_words):
+    index = search.SearchIndex(all_words)
+    with pytest.raises(ValueError):
+        list(index.search("??"))
+    with pytest.raises(ValueError):
+        list(index.search("A1???"))
+    assert list(index.search("?????", include="Q", exclude="Q")) == []
+
+
+def test_intersect():
+    lists = [[1, 3, 5, 7, 9], [3, 4, 5, 9], [0, 3, 9, 10]]
+    assert list(search.intersect(lists)) == [3, 9]
+    assert list(search.intersect([[1, 2], []])) == []
@@ -0,0 +1,59 @@
+import multiprocessing
+
+import pytest
+
+import server
+import snapshot
+import words
+
+
+@pytest.fixture(scope="module")
+def game_server():
+    return server.GameServer(words.DEFAULT_LENGTH, capacity=64)
+
+
+def _play(game_server, sessions, queue):
+    accepted = 0
+    for _ in range(game_server.max_tries):
+        for session_id in sessions:
+            try:
+                game_server.guess(session_id, "QAJAQ")
+                accepted += 1
+            except server.ApiError:
+                pass
+    queue.put(accepted)
+
+
+def test_guesses_from_two_workers_are_all_kept(game_server):
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork")
+    context = multiprocessing.get_context("fork")
+    sessions = [game_server.new()["session"] for _ in range(32)]
+    queue = context.Queue()
+    workers = [
+        context.Process(target=_play, args=(game_server, sessions, queue))
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    accepted = queue.get(timeout=60) + queue.get(timeout=60)
+    for worker in workers:
+        worker.join()
+
+    stored = [len(game_server.sessions.get(s).state.guesses) for s in sessions]
+    assert stored == [game_server.max_tries] * len(sessions)
+    assert accepted == sum(stored)
+
+
+def test_guess_and_state(game_server):
+    session = game_server.new()["session"]
+    reply = game_server.guess(session, "crane")
+    assert reply["word"] == "CRANE" and not reply["over"]
+    state = game_server.state(session)
+    assert state["guesses"] == ["CRANE"]
+    data = snapshot.from_share_code(state["code"])
+    assert snapshot.GameState.unpack(data, game_server.answers, game_server.all_words)
+    with pytest.raises(server.ApiError, match="Unknown session"):
+        game_server.guess("0-0", "CRANE")
+    with pytest.raises(server.ApiError, match="Unknown session"):
+        game_server.guess(None, "CRANE")
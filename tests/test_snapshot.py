@@ -0,0 +1,53 @@
+import pytest
+
+import game
+import server
+import snapshot
+import words
+
+
+@pytest.mark.parametrize("n", [0, 1, 127, 128, 300, 16383, 16384, 2**32 + 5])
+def test_varint_round_trip(n):
+    data = b"\xff" + bytes(snapshot.varint(n))
+    assert snapshot.read_varint(data, 1) == (n, len(data))
+
+
+def test_truncated_varint():
+    with pytest.raises(ValueError):
+        snapshot.read_varint(bytes(snapshot.varint(300))[:1], 0)
+
+
+def test_share_code_round_trip():
+    answers = words.load_answers()
+    all_words = words.load_all_words()
+    g = game.Game(answers[42], all_words)
+    g.guess("CRANE")
+    g.guess("SLOTH")
+    state = snapshot.GameState.from_game(g, answers, all_words, typed="AB")
+
+    code = snapshot.share_code(state.pack(answers, all_words))
+    restored = snapshot.GameState.unpack(
+        snapshot.from_share_code(code), answers, all_words
+    )
+
+    assert restored.answer == 42
+    assert restored.typed == "AB"
+    assert restored.to_game(answers, all_words, 6).history == g.history
+
+
+def test_unpack_rejects_other_wordlists():
+    answers = words.load_answers()
+    all_words = words.load_all_words()
+    data = snapshot.GameState(5, 0).pack(answers, all_words)
+    with pytest.raises(ValueError):
+        snapshot.GameState.unpack(data, tuple(answers[:10]), all_words)
+
+
+def test_server_rejects_finished_games():
+    server_game = server.GameServer(words.DEFAULT_LENGTH, capacity=16)
+    answers = server_game.answers
+    state = snapshot.GameState(5, 0, [server_game.all_words.index(answers[0])])
+    code = snapshot.share_code(state.pack(answers, server_game.all_words))
+
+    with pytest.raises(server.ApiError, match="already finished"):
+        server_game.new(code)
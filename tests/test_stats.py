@@ -0,0 +1,71 @@
+import json
+
+import stats
+
+
+def game(answer="CRANE", won=True):
+    return {
+        "time": 0,
+        "answer": answer,
+        "guesses": ["SLATE", answer],
+        "won": won,
+        "seconds": 10.0,
+    }
+
+
+def write_log(path, records, tail=b""):
+    with open(path, "wb") as f:
+        for record in records:
+            f.write((json.dumps(record) + "\n").encode())
+        f.write(tail)
+
+
+def test_replay_stops_at_a_torn_line(tmp_path):
+    write_log(tmp_path / "games.log", [game(), game(won=False)], b'{"time": 0, "ans')
+    s = stats.Stats(tmp_path)
+    assert s.for_length(5)["played"] == 2
+    assert s.offset == len((tmp_path / "games.log").read_bytes()) - 16
+
+
+def test_append_cuts_a_torn_line(tmp_path):
+    write_log(tmp_path / "games.log", [game()], b'{"time": 0, "ans')
+    s = stats.Stats(tmp_path)
+    s.record("SLOTH", ["SLOTH"], True, 3.0)
+    s.close()
+
+    lines = (tmp_path / "games.log").read_bytes().splitlines(keepends=True)
+    assert len(lines) == 2 and all(line.endswith(b"\n") for line in lines)
+    assert stats.Stats(tmp_path).for_length(5)["played"] == 2
+
+
+def test_snapshot_is_read_instead_of_the_log(tmp_path):
+    s = stats.Stats(tmp_path)
+    for won in (True, True, False):
+        s.record("CRANE", ["CRANE"], won, 1.0)
+    s.close()
+
+    snapshot = json.loads((tmp_path / "stats.json").read_text())
+    assert snapshot["offset"] == (tmp_path / "games.log").stat().st_size
+    assert snapshot["totals"] == s.totals
+    t = s.for_length(5)
+    assert (t["played"], t["won"], t["streak"], t["max_streak"]) == (3, 2, 0, 2)
+
+    # totals only come from the snapshot once the log is caught up
+    snapshot["totals"]["5"]["played"] = 99
+    (tmp_path / "stats.json").write_text(json.dumps(snapshot))
+    assert stats.Stats(tmp_path).for_length(5)["played"] == 99
+
+
+def test_games_of_two_instances_are_kept(tmp_path):
+    first, second = stats.Stats(tmp_path), stats.Stats(tmp_path)
+    first.record("CRANE", ["CRANE"], True, 1.0)
+    first.close()
+    second.record("SLOTH", ["SLOTH"], True, 1.0)
+    second.close()
+    first.record("TRACE", ["TRACE"], False, 1.0)
+    first.close()
+
+    answers = [r["answer"] for r, _ in stats.Stats(tmp_path).replay()]
+    assert answers == ["CRANE", "SLOTH", "TRACE"]
+    totals = stats.Stats(tmp_path).for_length(5)
+    assert (totals["played"], totals["won"]) == (3, 2)
@@ -0,0 +1,36 @@
+import pytest
+
+import scoring
+import strategy
+import words
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(words, "CACHE_DIR", tmp_path)
+    strategy._load.cache_clear()
+    yield tmp_path
+    strategy._load.cache_clear()
+
+
+def test_a_miss_is_not_cached(cache_dir):
+    assert strategy.load() is None
+
+    all_words = words.load_all_words()
+    crane = all_words.index("CRANE")
+    trace = all_words.index("TRACE")
+    pattern = scoring.score("CRANE", "TRACE")
+    strategy.save(strategy.strategy_path(), (crane, [(pattern, (trace, []))]), 5)
+
+    plan = strategy.load()
+    assert plan.hint() == "CRANE"
+    assert plan.hint([("CRANE", pattern)]) == "TRACE"
+    assert plan.hint([("SLATE", pattern)]) is None
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "strategy.bin"
+    for data in (b"PW", b"PWWL" + bytes(16)):
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            strategy.Strategy(path, words.load_all_words())
@@ -1,14 +1,37 @@
-from tkinter import ttk
-from pathlib import Path
+import time
+
+# when wordle started importing, startup timings of --profile count from here
+STARTED = time.perf_counter()
+
+from itertools import islice
+from tkinter import filedialog, ttk
 
 import tkinter as tk
-import random
+import argparse
+import logging
+import multiprocessing
+import queue
 import string
 import sys
-
-
-WORD_LEN = 5
-MAX_TRIES = 6
+import threading
+
+import constraints
+import deck
+import events
+import game
+import profiling
+import recordings
+import render
+import scoring
+import search
+import snapshot
+import stats
+import strategy
+import tasks
+import words
+
+WORD_LEN = game.WORD_LEN
+MAX_TRIES = game.MAX_TRIES
 COLOR_BORDER_HIGHLIGHT = "#565758"
 COLOR_BLANK = "#121213"
 COLOR_INCORRECT = "#3a3a3c"
@@ -16,90 +39,915 @@ COLOR_HALF_CORRECT = "#b59f3b"
 COLOR_CORRECT = "#538d4e"
 BOX_SIZE = 55
 PADDING = 3
-
-try:
-    BASE_PATH = Path(sys._MEIPASS)
-except AttributeError:
-    BASE_PATH = Path(".")
-
-VALID_WORDS_WORDLIST = BASE_PATH / "wordlists/wordle-allowed-guesses.txt"
-ANSWERS_WORDLIST = BASE_PATH / "wordlists/wordle-answers.txt"
+KEYBOARD_ROWS = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
+KEY_WIDTH = 40
+WIDE_KEY_WIDTH = 75
+KEY_HEIGHT = 55
+BOARD_COUNTS = (1, 4, 8, 16)
+# boards per row and box size of the multi board modes
+MULTI_LAYOUT = {4: (4, 34), 8: (4, 24), 16: (8, 14)}
+BOARD_GAP = 12
+# the solver ranks a hint in processes of its own, on the task thread the
+# ranking would hold the GIL and stall the window while it runs. they are
+# spawned, a fork would copy the running Tk app. a frozen exe ranks in
+# process, its workers would start the whole app again
+HINT_PROCESSES = None if getattr(sys, "frozen", False) else 2
+DIGIT_COLORS = {
+    scoring.ABSENT: COLOR_INCORRECT,
+    scoring.PRESENT: COLOR_HALF_CORRECT,
+    scoring.CORRECT: COLOR_CORRECT,
+}
+
+BASE_PATH = words.BASE_PATH
 APP_ICON = BASE_PATH / "assets/wordle_logo_32x32.png"
 BACKSPACE_ICON = BASE_PATH / "assets/backspace.png"
 HELP_ICON = BASE_PATH / "assets/help.png"
 SETTINGS_ICON = BASE_PATH / "assets/settings.png"
-MANUAL_IMAGE = BASE_PATH / "assets/manual_image2.png"
 
-ANSWERS = set(word.upper() for word in open(ANSWERS_WORDLIST).read().splitlines())
-ALL_WORDS = (
-    set(word.upper() for word in open(VALID_WORDS_WORDLIST).read().splitlines())
-    | ANSWERS
-)
+# loaded on first use
+ANSWERS = words.ANSWERS
+ALL_WORDS = words.ALL_WORDS
+
+
+class WidgetBoard(tk.Frame):
+    """the game grid and virtual keyboard, built out of frames and labels"""
+
+    def __init__(self, master, screen, rows, cols, *args, **kwargs):
+        tk.Frame.__init__(self, master, *args, bg=COLOR_BLANK, **kwargs)
+        self.renderer = screen.renderer
+        self.grid_rowconfigure(0, weight=1)
+
+        # ==> main game grid ==>
+        container = tk.Frame(self, bg=COLOR_BLANK)
+        container.grid()
+
+        self.labels = []
+        for i in range(rows):
+            row = []
+            for j in range(cols):
+                cell = tk.Frame(
+                    container,
+                    width=BOX_SIZE,
+                    height=BOX_SIZE,
+                    highlightthickness=1,
+                    highlightbackground=COLOR_INCORRECT,
+                )
+                cell.grid_propagate(0)
+                cell.grid_rowconfigure(0, weight=1)
+                cell.grid_columnconfigure(0, weight=1)
+                cell.grid(row=i, column=j, padx=PADDING, pady=PADDING)
+                t = tk.Label(
+                    cell,
+                    text="",
+                    justify="center",
+                    font=("Helvetica Neue", 24, "bold"),
+                    bg=COLOR_BLANK,
+                    fg="#d7dadc",
+                    highlightthickness=1,
+                    highlightbackground=COLOR_BLANK,
+                )
+                t.grid(sticky="nswe")
+                self.renderer.register(
+                    t, text="", bg=COLOR_BLANK, highlightbackground=COLOR_BLANK
+                )
+                row.append(t)
+            self.labels.append(row)
+        # <== main game grid <==
+
+        # bottom separator, shows how many answers are still possible
+        container = tk.Frame(self, bg=COLOR_BLANK, height=45)
+        container.grid_rowconfigure(0, weight=1)
+        container.grid_columnconfigure(0, weight=1)
+        container.grid_propagate(False)
+        container.grid(sticky="we")
+        tk.Label(
+            container,
+            textvariable=screen.remaining_text,
+            font=("Helvetica Neue", 13),
+            bg=COLOR_BLANK,
+            fg="#818384",
+        ).grid(row=0, column=0)
+
+        # ==> virtual keyboard ==>
+        container = tk.Frame(self, bg=COLOR_BLANK)
+        container.grid()
+
+        # add all the alphabets
+        self.keyboard_buttons = {}
+        for i, keys in enumerate(KEYBOARD_ROWS):
+            row = tk.Frame(container, bg=COLOR_BLANK)
+            row.grid(row=i, column=0)
+
+            for j, c in enumerate(keys):
+                if i == 2:  # leave one column for the ENTER button in the last row
+                    j += 1
+
+                cell = tk.Frame(
+                    row,
+                    width=KEY_WIDTH,
+                    height=KEY_HEIGHT,
+                    highlightthickness=1,
+                    highlightbackground=COLOR_INCORRECT,
+                )
+                cell.grid_propagate(0)
+                cell.grid_rowconfigure(0, weight=1)
+                cell.grid_columnconfigure(0, weight=1)
+                cell.grid(row=0, column=j, padx=PADDING, pady=PADDING)
+                btn = tk.Button(
+                    cell,
+                    text=c,
+                    justify="center",
+                    font=("Helvetica Neue", 13),
+                    bg=COLOR_BLANK,
+                    fg="#d7dadc",
+                    cursor="hand2",
+                    border=0,
+                    command=lambda c=c: screen.enter_letter(key=c),
+                )
+                btn.grid(sticky="nswe")
+                self.renderer.register(btn, bg=COLOR_BLANK)
+                self.keyboard_buttons[c] = btn
+
+        for col in (0, 8):
+            text = "ENTER" if col == 0 else ""
+            func = screen.check_word if col == 0 else screen.remove_letter
+            cell = tk.Frame(
+                row,
+                width=WIDE_KEY_WIDTH,
+                height=KEY_HEIGHT,
+                highlightthickness=1,
+                highlightbackground=COLOR_INCORRECT,
+            )
+            cell.grid_propagate(0)
+            cell.grid_rowconfigure(0, weight=1)
+            cell.grid_columnconfigure(0, weight=1)
+            cell.grid(row=0, column=col, padx=PADDING, pady=PADDING)
+            btn = tk.Button(
+                cell,
+                text=text,
+                justify="center",
+                font=("Helvetica Neue", 13),
+                bg=COLOR_BLANK,
+                fg="#d7dadc",
+                cursor="hand2",
+                border=0,
+                command=func,
+            )
+            btn.grid(row=0, column=0, sticky="nswe")
+
+        # set the image for delete button
+        btn.configure(image=screen.icons["backspace"])
+        # <== virtual keyboard <==
+
+    def set_cell(self, row, col, text, bg, border):
+        self.renderer.set(
+            self.labels[row][col], text=text, bg=bg, highlightbackground=border
+        )
+
+    def set_key(self, key, bg):
+        self.renderer.set(self.keyboard_buttons[key], bg=bg)
+
+
+class CanvasItem:
+    """lets the renderer configure a canvas item like it was a widget"""
+
+    def __init__(self, canvas, item):
+        self.canvas = canvas
+        self.item = item
+
+    def configure(self, **options):
+        self.canvas.itemconfigure(self.item, **options)
+
+
+class CanvasBoard(tk.Canvas):
+    """
+    the same grid and keyboard as WidgetBoard, drawn as items on a single
+    canvas instead of ~120 widgets. With boards > 1 it draws that many
+    smaller grids above one keyboard.
+    """
+
+    def __init__(self, master, screen, rows, cols, *args, boards=1, **kwargs):
+        self.renderer = screen.renderer
+        per_row, box = MULTI_LAYOUT.get(boards, (1, BOX_SIZE))
+        pad = PADDING if boards == 1 else 1
+        cell = box + 2 * pad
+        key = KEY_WIDTH + 2 * PADDING
+        key_row = KEY_HEIGHT + 2 * PADDING
+        wide_key = WIDE_KEY_WIDTH + 2 * PADDING
+        board_width = cols * cell
+        board_height = rows * cell
+        board_rows = -(-boards // per_row)
+        grid_width = per_row * (board_width + BOARD_GAP) - BOARD_GAP
+        keyboard_width = max(
+            len(KEYBOARD_ROWS[0]) * key, len(KEYBOARD_ROWS[2]) * key + 2 * wide_key
+        )
+        width = max(grid_width, keyboard_width)
+        status_top = board_rows * (board_height + BOARD_GAP) - BOARD_GAP
+        keyboard_top = status_top + 45
+        height = keyboard_top + len(KEYBOARD_ROWS) * key_row
+
+        tk.Canvas.__init__(
+            self,
+            master,
+            *args,
+            width=width,
+            height=height,
+            bg=COLOR_BLANK,
+            highlightthickness=0,
+            **kwargs,
+        )
+
+        # ==> main game grids ==>
+        # cells[board][row][col] is a (box, text) pair
+        self.cells = []
+        font = ("Helvetica Neue", max(8, 24 * box // BOX_SIZE), "bold")
+        for b in range(boards):
+            left = (width - grid_width) // 2 + b % per_row * (board_width + BOARD_GAP)
+            top = b // per_row * (board_height + BOARD_GAP)
+            grid = []
+            for i in range(rows):
+                row = []
+                for j in range(cols):
+                    x = left + j * cell + pad
+                    y = top + i * cell + pad
+                    self.create_rectangle(
+                        x, y, x + box, y + box, outline=COLOR_INCORRECT
+                    )
+                    rect = self.create_rectangle(
+                        x + 1,
+                        y + 1,
+                        x + box - 1,
+                        y + box - 1,
+                        fill=COLOR_BLANK,
+                        outline=COLOR_BLANK,
+                    )
+                    text = self.create_text(
+                        x + box / 2, y + box / 2, text="", font=font, fill="#d7dadc"
+                    )
+                    rect, text = CanvasItem(self, rect), CanvasItem(self, text)
+                    self.renderer.register(rect, fill=COLOR_BLANK, outline=COLOR_BLANK)
+                    self.renderer.register(text, text="")
+                    row.append((rect, text))
+                grid.append(row)
+            self.cells.append(grid)
+        # <== main game grids <==
+
+        # how many answers are still possible
+        status = tk.Label(
+            self,
+            textvariable=screen.remaining_text,
+            font=("Helvetica Neue", 13),
+            bg=COLOR_BLANK,
+            fg="#818384",
+        )
+        self.create_window(width / 2, status_top + 45 / 2, window=status)
+
+        # ==> virtual keyboard ==>
+        self.keys = {}
+        self.key_actions = {}
+        for i, keys in enumerate(KEYBOARD_ROWS):
+            row = [(c, KEY_WIDTH) for c in keys]
+            if i == 2:
+                row = [("ENTER", WIDE_KEY_WIDTH)] + row + [("", WIDE_KEY_WIDTH)]
+            x = (width - sum(w + 2 * PADDING for _, w in row)) // 2 + PADDING
+            y = keyboard_top + i * key_row + PADDING
+            for c, w in row:
+                rect = self.create_rectangle(
+                    x,
+                    y,
+                    x + w,
+                    y + KEY_HEIGHT,
+                    fill=COLOR_BLANK,
+                    outline=COLOR_INCORRECT,
+                    tags="key",
+                )
+                if c:
+                    label = self.create_text(
+                        x + w / 2,
+                        y + KEY_HEIGHT / 2,
+                        text=c,
+                        font=("Helvetica Neue", 13),
+                        fill="#d7dadc",
+                        tags="key",
+                    )
+                else:
+                    label = self.create_image(
+                        x + w / 2,
+                        y + KEY_HEIGHT / 2,
+                        image=screen.icons["backspace"],
+                        tags="key",
+                    )
+
+                if c == "ENTER":
+                    action = screen.check_word
+                elif not c:
+                    action = screen.remove_letter
+                else:
+                    action = lambda c=c: screen.enter_letter(key=c)
+                    self.keys[c] = CanvasItem(self, rect)
+                    self.renderer.register(self.keys[c], fill=COLOR_BLANK)
+                self.key_actions[rect] = self.key_actions[label] = action
+                x += w + 2 * PADDING
+        # <== virtual keyboard <==
+
+        self.tag_bind("key", "<Button-1>", self.click)
+        self.tag_bind("key", "<Enter>", lambda e: self.configure(cursor="hand2"))
+        self.tag_bind("key", "<Leave>", lambda e: self.configure(cursor=""))
+
+    def click(self, event):
+        """run the action of the key under the mouse"""
+        for item in self.find_withtag("current"):
+            action = self.key_actions.get(item)
+            if action:
+                action()
+
+    def set_cell(self, row, col, text, bg, border, board=0):
+        box, label = self.cells[board][row][col]
+        self.renderer.set(box, fill=bg, outline=border)
+        self.renderer.set(label, text=text)
+
+    def set_key(self, key, bg):
+        self.renderer.set(self.keys[key], fill=bg)
 
 
 class HelpScreen(tk.Frame):
     def __init__(self, master, controller, *args, **kwargs):
         tk.Frame.__init__(self, master, *args, **kwargs)
         self.controller = controller
+        self.grid_columnconfigure(0, weight=1)
+        # the search index is built off the ui thread
+        self.tasks = tasks.Tasks(self)
+        # matches not shown yet, pulled a page at a time
+        self.matches = None
+
+        tk.Label(
+            self,
+            text="HELP",
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 28, "bold"),
+        ).grid(pady=10)
+        ttk.Separator(self).grid(sticky="ew")
+
+        tk.Label(
+            self,
+            text=(
+                f"Guess the word in {controller.max_tries} tries. After every guess "
+                "green letters are in the right spot, yellow letters are in the "
+                "word but elsewhere and grey letters are not in it."
+            ),
+            wraplength=500,
+            justify="left",
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 13),
+        ).grid(sticky="w", padx=20, pady=(20, 5))
+
+        # ==> word search ==>
+        tk.Label(
+            self,
+            text="Word Search",
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 16, "bold"),
+        ).grid(sticky="w", padx=20, pady=(20, 5))
+
+        form = tk.Frame(self, bg=COLOR_BLANK)
+        form.grid(sticky="w", padx=30)
+        self.pattern = tk.StringVar(value="?" * controller.word_len)
+        self.include = tk.StringVar()
+        self.exclude = tk.StringVar()
+        fields = (
+            ("Pattern", self.pattern),
+            ("Has", self.include),
+            ("Hasn't", self.exclude),
+        )
+        for column, (text, variable) in enumerate(fields):
+            tk.Label(
+                form,
+                text=text,
+                fg="#818384",
+                bg=COLOR_BLANK,
+                font=("Helvetica Neue", 12),
+            ).grid(row=0, column=column, sticky="w", padx=(0, 10))
+            entry = tk.Entry(form, textvariable=variable, width=10)
+            entry.grid(row=1, column=column, sticky="w", padx=(0, 10))
+            entry.bind("<Return>", self.search)
+
+        self.answers_only = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            form,
+            text="Answers only",
+            variable=self.answers_only,
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            selectcolor=COLOR_BLANK,
+            activebackground=COLOR_BLANK,
+            activeforeground="#d7dadc",
+            font=("Helvetica Neue", 12),
+        ).grid(row=1, column=3, padx=(0, 10))
+        tk.Button(
+            form,
+            text="Search",
+            font=("Helvetica Neue", 13),
+            bg=COLOR_INCORRECT,
+            fg="#d7dadc",
+            border=0,
+            cursor="hand2",
+            command=self.search,
+        ).grid(row=1, column=4)
+
+        results = tk.Frame(self, bg=COLOR_BLANK)
+        results.grid(sticky="w", padx=30, pady=(10, 0))
+        scrollbar = tk.Scrollbar(results)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.results = tk.Listbox(
+            results,
+            height=12,
+            width=30,
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Courier", 13),
+            yscrollcommand=lambda first, last: self.scrolled(scrollbar, first, last),
+        )
+        self.results.grid(row=0, column=0)
+        scrollbar.config(command=self.results.yview)
 
-        tk.Label(self, text="Help").grid()
+        self.search_status = tk.StringVar()
+        tk.Label(
+            self,
+            textvariable=self.search_status,
+            fg="#818384",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 12),
+        ).grid(sticky="w", padx=30)
+        # <== word search <==
+
+        tk.Button(
+            self,
+            text="Back",
+            font=("Helvetica Neue", 13),
+            bg=COLOR_INCORRECT,
+            fg="#d7dadc",
+            border=0,
+            cursor="hand2",
+            command=lambda: self.controller.show_frame("MainScreen"),
+        ).grid(pady=20)
+
+    def search(self, event=None):
+        """start a search of the wordlist being played"""
+        length = self.controller.word_len
+        wordlist = self.controller.wordlist
+        if self.answers_only.get():
+            wordlist = words.load_answers(length, wordlist)
+        else:
+            wordlist = words.load_all_words(length, wordlist)
+        query = self.pattern.get(), self.include.get(), self.exclude.get()
+
+        self.tasks.cancel_all()
+        self.matches = None
+        self.results.delete(0, "end")
+        self.search_status.set("Searching...")
+        self.tasks.submit(
+            search.load_index,
+            wordlist,
+            callback=lambda index: self.show_matches(index, *query),
+        )
+
+    def show_matches(self, index, pattern, include, exclude):
+        try:
+            first, self.matches = index.page(pattern, include, exclude)
+        except ValueError as e:
+            self.search_status.set(str(e))
+            return
+        self.show_page(first)
+
+    def show_page(self, page):
+        self.results.insert("end", *page)
+        shown = self.results.size()
+        if len(page) < search.PAGE_SIZE:
+            self.matches = None
+            self.search_status.set(f"{shown} words")
+        else:
+            self.search_status.set(f"{shown}+ words, scroll for more")
+
+    def scrolled(self, scrollbar, first, last):
+        """pull the next page of matches once the end of the list shows"""
+        scrollbar.set(first, last)
+        if self.matches is not None and float(last) >= 1.0:
+            self.show_page(list(islice(self.matches, search.PAGE_SIZE)))
 
 
 class SettingsScreen(tk.Frame):
     def __init__(self, master, controller, *args, **kwargs):
         tk.Frame.__init__(self, master, *args, **kwargs)
         self.controller = controller
+        self.grid_columnconfigure(0, weight=1)
+
+        tk.Label(
+            self,
+            text="SETTINGS",
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 28, "bold"),
+        ).grid(pady=10)
+        ttk.Separator(self).grid(sticky="ew")
+
+        # ==> wordlist picker ==>
+        tk.Label(
+            self,
+            text="Wordlist",
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 16, "bold"),
+        ).grid(sticky="w", padx=20, pady=(20, 5))
+
+        self.wordlist = tk.StringVar(value="")
+        self.wordlist_options = tk.Frame(self, bg=COLOR_BLANK)
+        self.wordlist_options.grid(sticky="w", padx=30)
+        self.refresh_wordlists()
+
+        tk.Button(
+            self,
+            text="Import Wordlist...",
+            font=("Helvetica Neue", 13),
+            bg=COLOR_INCORRECT,
+            fg="#d7dadc",
+            border=0,
+            cursor="hand2",
+            command=self.import_wordlist,
+        ).grid(sticky="w", padx=30, pady=10)
+
+        self.import_status = tk.StringVar()
+        tk.Label(
+            self,
+            textvariable=self.import_status,
+            fg="#818384",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 12),
+        ).grid(sticky="w", padx=30)
+        # <== wordlist picker <==
+
+        if self.controller.boards == 1:
+            self.hard = tk.BooleanVar(value=self.controller.hard)
+            tk.Checkbutton(
+                self,
+                text="Hard Mode - revealed hints must be used in later guesses",
+                variable=self.hard,
+                command=lambda: self.controller.set_hard(self.hard.get()),
+                fg="#d7dadc",
+                bg=COLOR_BLANK,
+                selectcolor=COLOR_BLANK,
+                activebackground=COLOR_BLANK,
+                activeforeground="#d7dadc",
+                font=("Helvetica Neue", 13),
+            ).grid(sticky="w", padx=20, pady=(20, 5))
+
+            self.absurd = tk.BooleanVar(value=self.controller.absurd)
+            tk.Checkbutton(
+                self,
+                text="Absurdle - the answer dodges your guesses, starts a new game",
+                variable=self.absurd,
+                command=lambda: self.controller.set_absurd(self.absurd.get()),
+                fg="#d7dadc",
+                bg=COLOR_BLANK,
+                selectcolor=COLOR_BLANK,
+                activebackground=COLOR_BLANK,
+                activeforeground="#d7dadc",
+                font=("Helvetica Neue", 13),
+            ).grid(sticky="w", padx=20, pady=5)
+
+        tk.Button(
+            self,
+            text="Back",
+            font=("Helvetica Neue", 13),
+            bg=COLOR_INCORRECT,
+            fg="#d7dadc",
+            border=0,
+            cursor="hand2",
+            command=lambda: self.controller.show_frame("MainScreen"),
+        ).grid(pady=20)
+
+    def refresh_wordlists(self):
+        """list the default wordlist and the imported ones with our word length"""
+        for child in self.wordlist_options.winfo_children():
+            child.destroy()
+
+        options = [("Default", "")] + [
+            (name, name)
+            for name, lengths in words.custom_wordlists().items()
+            if self.controller.word_len in lengths
+        ]
+        for text, value in options:
+            tk.Radiobutton(
+                self.wordlist_options,
+                text=text,
+                value=value,
+                variable=self.wordlist,
+                font=("Helvetica Neue", 13),
+                fg="#d7dadc",
+                bg=COLOR_BLANK,
+                activebackground=COLOR_BLANK,
+                activeforeground="#d7dadc",
+                selectcolor=COLOR_INCORRECT,
+                cursor="hand2",
+                command=self.select_wordlist,
+            ).grid(sticky="w")
+
+    def select_wordlist(self):
+        self.controller.set_wordlist(self.wordlist.get() or None)
+
+    def import_wordlist(self):
+        """stream a dictionary file into a custom wordlist off the ui thread"""
+        path = filedialog.askopenfilename(
+            title="Import Wordlist", filetypes=[("Text files", "*.txt"), ("All", "*")]
+        )
+        if not path:
+            return
+
+        import ingest
+
+        name = ingest.wordlist_name(path)
+        progress = queue.Queue()
+
+        def run():
+            try:
+                counts = ingest.ingest(path, name, lambda *p: progress.put(p))
+                progress.put(("done", sum(counts.values())))
+            except Exception as e:
+                # anything left uncaught here would keep the poll going forever
+                progress.put(("error", str(e) or type(e).__name__))
+
+        def poll():
+            while True:
+                try:
+                    update = progress.get_nowait()
+                except queue.Empty:
+                    if not worker.is_alive() and progress.empty():
+                        self.import_status.set("Import failed")
+                        return
+                    self.after(100, poll)
+                    return
+                if update[0] == "done":
+                    self.import_status.set(f"Imported {update[1]} words as {name}")
+                    self.refresh_wordlists()
+                    return
+                if update[0] == "error":
+                    self.import_status.set(f"Import failed: {update[1]}")
+                    return
+                done, total, lines = update
+                percent = 100 * done // total if total else 100
+                self.import_status.set(f"Importing {name}... {percent}%")
+
+        self.import_status.set(f"Importing {name}...")
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        poll()
+
+
+class StatsScreen(tk.Frame):
+    def __init__(self, master, controller, *args, **kwargs):
+        tk.Frame.__init__(self, master, *args, **kwargs)
+        self.controller = controller
+        self.grid_columnconfigure(0, weight=1)
 
-        tk.Label(self, text="Settings").grid()
+        tk.Label(
+            self,
+            text="STATISTICS",
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 28, "bold"),
+        ).grid(pady=10)
+        ttk.Separator(self).grid(sticky="ew")
+
+        # played, win %, current streak and max streak side by side
+        numbers = tk.Frame(self, bg=COLOR_BLANK)
+        numbers.grid(pady=20)
+        self.numbers = {}
+        for col, name in enumerate(("Played", "Win %", "Streak", "Max Streak")):
+            self.numbers[name] = tk.StringVar()
+            tk.Label(
+                numbers,
+                textvariable=self.numbers[name],
+                fg="#d7dadc",
+                bg=COLOR_BLANK,
+                font=("Helvetica Neue", 28),
+            ).grid(row=0, column=col, padx=10)
+            tk.Label(
+                numbers,
+                text=name,
+                fg="#d7dadc",
+                bg=COLOR_BLANK,
+                font=("Helvetica Neue", 11),
+            ).grid(row=1, column=col, padx=10)
+
+        tk.Label(
+            self,
+            text="GUESS DISTRIBUTION",
+            fg="#d7dadc",
+            bg=COLOR_BLANK,
+            font=("Helvetica Neue", 16, "bold"),
+        ).grid(pady=(10, 5))
+
+        # one bar per number of tries
+        distribution = tk.Frame(self, bg=COLOR_BLANK)
+        distribution.grid()
+        self.bars = []
+        # single board games only, so one bar per try of those
+        for i in range(controller.word_len + 1):
+            tk.Label(
+                distribution,
+                text=i + 1,
+                fg="#d7dadc",
+                bg=COLOR_BLANK,
+                font=("Helvetica Neue", 13),
+            ).grid(row=i, column=0, padx=5, pady=2)
+            bar = tk.Label(
+                distribution,
+                fg="#d7dadc",
+                bg=COLOR_INCORRECT,
+                anchor="e",
+                font=("Helvetica Neue", 13, "bold"),
+            )
+            bar.grid(row=i, column=1, sticky="w", pady=2)
+            self.bars.append(bar)
+
+        tk.Button(
+            self,
+            text="Back",
+            font=("Helvetica Neue", 13),
+            bg=COLOR_INCORRECT,
+            fg="#d7dadc",
+            border=0,
+            cursor="hand2",
+            command=lambda: self.controller.show_frame("MainScreen"),
+        ).grid(pady=20)
+
+    def refresh(self):
+        """show the current totals, read from the in-memory snapshot"""
+        totals = self.controller.stats.for_length(self.controller.word_len)
+        played = totals["played"]
+        self.numbers["Played"].set(played)
+        self.numbers["Win %"].set(round(100 * totals["won"] / played) if played else 0)
+        self.numbers["Streak"].set(totals["streak"])
+        self.numbers["Max Streak"].set(totals["max_streak"])
+
+        counts = [
+            totals["distribution"].get(str(i + 1), 0) for i in range(len(self.bars))
+        ]
+        most = max(counts) or 1
+        for bar, n in zip(self.bars, counts):
+            bar.configure(text=n, width=2 + 28 * n // most)
 
 
 class MainScreen(tk.Frame):
     def __init__(self, master, controller, *args, **kwargs):
         tk.Frame.__init__(self, master, *args, **kwargs)
         self.controller = controller
+        self.word_len = controller.word_len
+        self.max_tries = controller.max_tries
 
         self.bind("<Return>", self.check_word)
         self.bind("<BackSpace>", self.remove_letter)
         self.bind("<Key>", self.enter_letter)
+        self.bind("<Control-s>", self.share)
 
-        self.init_ui()
-        self.new_game()
+        self.solver = None
+        self.renderer = render.Renderer(self)
+        self.tasks = tasks.Tasks(self)
 
-    def new_game(self):
-        self.answer = random.choice(list(ANSWERS)).upper()
-        self.words = [""] * 6
+        self.init_ui()
+        self.new_game(controller.saved_state)
+
+    def new_game(self, state=None):
+        """start a new game, or continue the one in a snapshot.GameState"""
+        self.renderer.action("new_game")
+        # results for the last board are of no use anymore
+        self.tasks.cancel_all()
+        self.game = self.start_game() if state is None else self.resume_game(state)
+        self.words = [""] * self.max_tries
         self.correct_letters = set()
         self.half_correct_letter = set()
         self.incorrect_letters = set()
+        self.remaining = None
+        self.remaining_text.set("")
+        self.started = time.monotonic()
+        # (key, time) of every key press, for the game recording
+        self.keys = []
+        self.started_at = time.time()
 
         # reset the grid and keyboard
-        for i in range(MAX_TRIES):
+        for i in range(self.max_tries):
             self.current_word = i
             self.update_labels()
         self.current_word = 0
+
+        # paint the guesses of a restored game over the reset board, the
+        # renderer only keeps the last value of every cell
+        for word, pattern in self.game.history:
+            self.words[self.current_word] = word
+            self.show_guess(word, pattern)
+            self.current_word += 1
+        if state is not None and not self.game.over:
+            self.words[self.current_word] = state.typed
+            self.update_labels()
         self.update_keyboard()
+        if self.game.history:
+            self.update_remaining()
 
         # hide the game over dialog
         self.game_over_dialog.place_forget()
+        if state is not None:
+            self.renderer.flush()
+
+    def start_game(self):
+        if self.controller.absurd:
+            # no answer to draw, the game narrows the answers down as it goes
+            new_game = game.AbsurdGame(
+                words.load_answers(self.word_len, self.controller.wordlist),
+                words.load_all_words(self.word_len, self.controller.wordlist),
+                self.max_tries,
+                hard=self.controller.hard,
+            )
+            self.controller.events.event(
+                "new_game",
+                absurd=True,
+                word_len=self.word_len,
+                wordlist=self.controller.wordlist,
+                hard=self.controller.hard,
+            )
+            return new_game
+
+        new_game = game.Game(
+            self.controller.deck.draw(),
+            words.load_all_words(self.word_len, self.controller.wordlist),
+            self.max_tries,
+            hard=self.controller.hard,
+        )
+        self.controller.events.event(
+            "new_game",
+            answer=new_game.answer,
+            word_len=self.word_len,
+            wordlist=self.controller.wordlist,
+            hard=self.controller.hard,
+        )
+        return new_game
+
+    def resume_game(self, state):
+        answers = words.load_answers(self.word_len, self.controller.wordlist)
+        all_words = words.load_all_words(self.word_len, self.controller.wordlist)
+        resumed = state.to_game(
+            answers, all_words, self.max_tries, hard=self.controller.hard
+        )
+        self.controller.events.event(
+            "resume_game",
+            answer=resumed.answer,
+            guesses=resumed.history,
+            word_len=self.word_len,
+            wordlist=self.controller.wordlist,
+        )
+        return resumed
+
+    def game_state(self):
+        """the packed snapshot of the current game"""
+        answers = words.load_answers(self.word_len, self.controller.wordlist)
+        all_words = words.load_all_words(self.word_len, self.controller.wordlist)
+        typed = "" if self.game.over else self.words[self.current_word]
+        state = snapshot.GameState.from_game(self.game, answers, all_words, typed)
+        return state.pack(answers, all_words)
+
+    def share(self, event=None):
+        """copy the code of the current game to the clipboard"""
+        if self.controller.absurd:
+            self.toast("Absurd games can't be shared")
+            return
+        if self.game.over:
+            self.toast("Game already finished")
+            return
+        code = snapshot.share_code(self.game_state())
+        self.clipboard_clear()
+        self.clipboard_append(code)
+        self.toast("Game code copied")
 
     def congratulate(self):
         praises = ["Genius", "Magnificent", "Impressive", "Splendid", "Great", "Phew"]
-        self.game_over_dialog_title.set(praises[self.current_word] + "!")
+        praise = praises[min(self.current_word, len(praises)) - 1]
+        self.game_over_dialog_title.set(praise + "!")
         self.game_over_dialog_message.set("Wanna Play Another Game?")
         self.game_over_dialog.place(relx=0.5, rely=0.5, anchor="center")
 
     def humiliate(self):
         self.game_over_dialog_title.set("Better Luck Next Time!")
         self.game_over_dialog_message.set(
-            f"One More Game?\n(BTW the word was {self.answer})"
+            f"One More Game?\n(BTW the word was {self.game.answer})"
         )
         self.game_over_dialog.place(relx=0.5, rely=0.5, anchor="center")
 
     def init_ui(self):
         self.icons = {
-            "settings": tk.PhotoImage(file=SETTINGS_ICON),
-            "help": tk.PhotoImage(file=HELP_ICON),
-            "backspace": tk.PhotoImage(file=BACKSPACE_ICON),
+            "settings": self.controller.image(SETTINGS_ICON),
+            "help": self.controller.image(HELP_ICON),
+            "backspace": self.controller.image(BACKSPACE_ICON),
         }
 
         # ==> top bar ==>
@@ -126,6 +974,30 @@ class MainScreen(tk.Frame):
             font=("Helvetica Neue", 28, "bold"),
         ).grid(row=0, column=1)
 
+        # hint button
+        tk.Button(
+            container,
+            text="Hint",
+            font=("Helvetica Neue", 13, "bold"),
+            bg=COLOR_BLANK,
+            fg="#d7dadc",
+            border=0,
+            cursor="hand2",
+            command=self.hint,
+        ).grid(row=0, column=2)
+
+        # stats button
+        tk.Button(
+            container,
+            text="Stats",
+            font=("Helvetica Neue", 13, "bold"),
+            bg=COLOR_BLANK,
+            fg="#d7dadc",
+            border=0,
+            cursor="hand2",
+            command=lambda: self.controller.show_frame("StatsScreen"),
+        ).grid(row=0, column=3)
+
         # settings button
         tk.Button(
             container,
@@ -134,7 +1006,7 @@ class MainScreen(tk.Frame):
             border=0,
             cursor="hand2",
             command=lambda: self.controller.show_frame("SettingsScreen"),
-        ).grid(row=0, column=2)
+        ).grid(row=0, column=4)
         # <== top bar <==
 
         # top separator
@@ -145,115 +1017,14 @@ class MainScreen(tk.Frame):
         self.top_separator.grid_propagate(False)
         self.top_separator.grid(sticky="news")
 
-        # ==> main game grid ==>
+        # ==> main game grid and virtual keyboard ==>
         # if there is extra space then give it to main game grid
         self.rowconfigure(3, weight=1)
 
-        container = tk.Frame(self, bg=COLOR_BLANK)
-        container.grid()
-
-        self.labels = []
-        for i in range(MAX_TRIES):
-            row = []
-            for j in range(WORD_LEN):
-                cell = tk.Frame(
-                    container,
-                    width=BOX_SIZE,
-                    height=BOX_SIZE,
-                    highlightthickness=1,
-                    highlightbackground=COLOR_INCORRECT,
-                )
-                cell.grid_propagate(0)
-                cell.grid_rowconfigure(0, weight=1)
-                cell.grid_columnconfigure(0, weight=1)
-                cell.grid(row=i, column=j, padx=PADDING, pady=PADDING)
-                t = tk.Label(
-                    cell,
-                    text="",
-                    justify="center",
-                    font=("Helvetica Neue", 24, "bold"),
-                    bg=COLOR_BLANK,
-                    fg="#d7dadc",
-                    highlightthickness=1,
-                    highlightbackground=COLOR_BLANK,
-                )
-                t.grid(sticky="nswe")
-                row.append(t)
-            self.labels.append(row)
-        # <== main game grid <==
-
-        # bottom empty separator
-        tk.Frame(self, bg=COLOR_BLANK, height=45).grid()
-
-        # ==> virtual keyboard ==>
-        container = tk.Frame(self, bg=COLOR_BLANK)
-        container.grid()
-
-        # add all the alphabets
-        self.keyboard_buttons = {}
-        for i, keys in enumerate(["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]):
-            row = tk.Frame(container, bg=COLOR_BLANK)
-            row.grid(row=i, column=0)
-
-            for j, c in enumerate(keys):
-                if i == 2:  # leave one column for the ENTER button in the last row
-                    j += 1
-
-                cell = tk.Frame(
-                    row,
-                    width=40,
-                    height=55,
-                    highlightthickness=1,
-                    highlightbackground=COLOR_INCORRECT,
-                )
-                cell.grid_propagate(0)
-                cell.grid_rowconfigure(0, weight=1)
-                cell.grid_columnconfigure(0, weight=1)
-                cell.grid(row=0, column=j, padx=PADDING, pady=PADDING)
-                btn = tk.Button(
-                    cell,
-                    text=c,
-                    justify="center",
-                    font=("Helvetica Neue", 13),
-                    bg=COLOR_BLANK,
-                    fg="#d7dadc",
-                    cursor="hand2",
-                    border=0,
-                    command=lambda c=c: self.enter_letter(key=c),
-                )
-                btn.grid(sticky="nswe")
-                self.keyboard_buttons[c] = btn
-
-        for col in (0, 8):
-            text = "ENTER" if col == 0 else ""
-            func = self.check_word if col == 0 else self.remove_letter
-            cell = tk.Frame(
-                row,
-                width=75,
-                height=55,
-                highlightthickness=1,
-                highlightbackground=COLOR_INCORRECT,
-            )
-            cell.grid_propagate(0)
-            cell.grid_rowconfigure(0, weight=1)
-            cell.grid_columnconfigure(0, weight=1)
-            cell.grid(row=0, column=col, padx=PADDING, pady=PADDING)
-            btn = tk.Button(
-                cell,
-                text=text,
-                justify="center",
-                font=("Helvetica Neue", 13),
-                bg=COLOR_BLANK,
-                fg="#d7dadc",
-                cursor="hand2",
-                border=0,
-                command=func,
-            )
-            btn.grid(row=0, column=0, sticky="nswe")
-
-        # set the image for delete button
-        btn.configure(image=self.icons["backspace"])
-        # <== virtual keyboard <==
+        self.remaining_text = tk.StringVar()
+        self.board = self.make_board()
+        self.board.grid(sticky="ns")
+        # <== main game grid and virtual keyboard <==
 
         # ==> game over dialog ==>
         # create game over dialog but dont place it yet
@@ -308,6 +1079,10 @@ class MainScreen(tk.Frame):
         ttk.Separator(f, orient="vertical").grid(row=0, column=1, sticky="ns")
         # <== game over dialog <==
 
+    def make_board(self):
+        board = CanvasBoard if self.controller.canvas_ui else WidgetBoard
+        return board(self, screen=self, rows=self.max_tries, cols=self.word_len)
+
     def toast(self, message, duration=2):
         """show a toast message which will disappear after {duration} seconds"""
         t = tk.Label(self.top_separator, text=message, font=("Helvetica Neue", 16))
@@ -315,137 +1090,513 @@ class MainScreen(tk.Frame):
         self.master.after(duration * 1000, lambda: t.grid_remove())
 
     def update_keyboard(self):
-        for key, btn in self.keyboard_buttons.items():
+        for key in string.ascii_uppercase:
             if key in self.correct_letters:
-                btn["bg"] = COLOR_CORRECT
+                color = COLOR_CORRECT
             elif key in self.half_correct_letter:
-                btn["bg"] = COLOR_HALF_CORRECT
+                color = COLOR_HALF_CORRECT
             elif key in self.incorrect_letters:
-                btn["bg"] = COLOR_INCORRECT
+                color = COLOR_INCORRECT
             else:
-                btn["bg"] = COLOR_BLANK
+                color = COLOR_BLANK
+            self.board.set_key(key, color)
+
+    def update_remaining(self):
+        """count the possible answers in the background and show how many are left"""
+        answers = words.load_answers(self.word_len, self.controller.wordlist)
+        self.tasks.submit(
+            remaining_answers,
+            answers,
+            list(self.game.history),
+            callback=self.show_remaining,
+        )
+
+    def show_remaining(self, remaining):
+        self.remaining = remaining
+        n = constraints.count(remaining)
+        self.remaining_text.set(f"{n} word remains" if n == 1 else f"{n} words remain")
 
     def update_labels(self, colors=None):
         word = self.words[self.current_word]
-        for i, label in enumerate(self.labels[self.current_word]):
+        for i in range(self.word_len):
             try:
                 letter = word[i]
             except IndexError:
                 letter = ""
 
-            label["text"] = letter
             if colors:
-                label["bg"] = colors[i]
-                label["highlightbackground"] = colors[i]
+                bg = border = colors[i]
             else:
-                label["bg"] = COLOR_BLANK
-                label["highlightbackground"] = (
-                    COLOR_BORDER_HIGHLIGHT if letter else COLOR_BLANK
-                )
+                bg = COLOR_BLANK
+                border = COLOR_BORDER_HIGHLIGHT if letter else COLOR_BLANK
+            self.board.set_cell(self.current_word, i, letter, bg, border)
 
     def check_word(self, event=None):
-        print("checking word:", self.words[self.current_word])
-        word = self.words[self.current_word]
-        if len(word) < WORD_LEN:
-            # messagebox.showinfo("You're an Idiot.", "Not Enough Letters.")
-            self.toast("Not Enough Letters")
+        self.renderer.action("check_word")
+        if self.game.over:
             return
 
-        if word not in ALL_WORDS:
-            # messagebox.showinfo("You're an Idiot.", "Word is not in wordlist.")
-            self.toast("Not in word list")
+        self.keys.append(("ENTER", time.monotonic()))
+        word = self.words[self.current_word]
+        try:
+            pattern = self.game.guess(word)
+        except game.InvalidGuess as e:
+            self.controller.events.event("invalid_guess", word=word, reason=str(e))
+            self.toast(str(e))
             return
+        self.controller.events.event("guess", word=word, pattern=pattern)
+
+        self.show_guess(word, pattern)
+        self.update_keyboard()
+        self.update_remaining()
 
+        self.current_word += 1
+        if self.game.over:
+            self.controller.events.event(
+                "game_over", won=self.game.won, tries=len(self.game.history)
+            )
+        # absurd games have no answer of their own, they aren't counted
+        if self.game.over and not self.controller.absurd:
+            self.controller.stats.record(
+                self.game.answer,
+                [guess for guess, _ in self.game.history],
+                self.game.won,
+                time.monotonic() - self.started,
+            )
+            if self.controller.wordlist is None:
+                recorder = self.controller.recorder
+                data = recorder.pack(
+                    self.started_at,
+                    time.monotonic() - self.started,
+                    self.game.answer,
+                    [guess for guess, _ in self.game.history],
+                    self.keys,
+                )
+                self.controller.io.submit(recorder.append, data)
+        if self.game.won:
+            self.congratulate()
+        elif self.game.over:
+            self.humiliate()
+
+    def show_guess(self, word, pattern):
+        """colour the current row and remember the letters for the keyboard"""
         colors = []
-        freq = {c: self.answer.count(c) for c in self.answer}
-        for x, y in zip(word, self.answer):
-            if x == y:
+        for x, digit in zip(word, scoring.decode(pattern, self.word_len)):
+            if digit == scoring.CORRECT:
                 colors.append(COLOR_CORRECT)
                 self.correct_letters.add(x)
-            elif freq.get(x, 0) > 0:
+            elif digit == scoring.PRESENT:
                 colors.append(COLOR_HALF_CORRECT)
                 self.half_correct_letter.add(x)
-                freq[x] -= 1
             else:
                 self.incorrect_letters.add(x)
                 colors.append(COLOR_INCORRECT)
         self.update_labels(colors)
-        self.update_keyboard()
 
-        self.current_word += 1
-        if word == self.answer:
-            self.congratulate()
-        elif self.current_word >= MAX_TRIES:
-            self.humiliate()
+    def hint(self):
+        """suggest the most informative next guess"""
+        if self.controller.wordlist is not None:
+            self.toast("No hints for custom wordlists")
+            return
+
+        # the precomputed strategy answers straight away while the game follows it
+        if self.game.hard is None:
+            plan = strategy.load(self.word_len)
+            word = plan and plan.hint(self.game.history)
+            if word:
+                self.toast(f"Try {word}")
+                return
+
+        try:
+            import solver
+        except ImportError:
+            self.toast("Hints need numpy installed")
+            return
+
+        # loading the pattern matrix and ranking guesses happen on the worker
+        self.tasks.submit(
+            self.best_guess,
+            solver,
+            list(self.game.history),
+            self.game.hard is not None,
+            callback=lambda word: word and self.toast(f"Try {word}"),
+        )
+
+    def best_guess(self, solver, history, hard=False):
+        """runs on the worker thread, which waits for the solver's processes"""
+        if self.solver is None:
+            self.solver = solver.Solver(
+                length=self.word_len, processes=HINT_PROCESSES, start_method="spawn"
+            )
+        allowed = None
+        if hard and history:
+            # only suggest guesses hard mode accepts
+            allowed = constraints.HardMode(self.game.valid_words, history).allowed()
+        return self.solver.best_guess(history, allowed)
 
     def remove_letter(self, event=None):
+        self.renderer.action("remove_letter")
+        if self.game.over:
+            return
+
         if self.words[self.current_word]:
-            print(self.words[self.current_word][-1], "was deleted.")
+            self.controller.events.key("delete")
+            self.keys.append(("BACKSPACE", time.monotonic()))
             self.words[self.current_word] = self.words[self.current_word][:-1]
             self.update_labels()
 
     def enter_letter(self, event=None, key=None):
         key = key or event.keysym.upper()
+        self.renderer.action("enter_letter")
+        if self.game.over:
+            return
+
         if key in string.ascii_uppercase:
-            print(key, "was entered.")
+            self.controller.events.key("letter", key=key)
+            self.keys.append((key, time.monotonic()))
             self.words[self.current_word] += key
             # prevent user from enterering excess letters
-            self.words[self.current_word] = self.words[self.current_word][:WORD_LEN]
+            word = self.words[self.current_word][: self.word_len]
+            self.words[self.current_word] = word
             self.update_labels()
 
 
+class MultiScreen(MainScreen):
+    """
+    quordle style game, every guess goes on one board per answer. Boards
+    are drawn on a single canvas and a key takes the best colour its letter
+    got on any board that is still being played.
+    """
+
+    def __init__(self, master, controller, *args, **kwargs):
+        self.boards = controller.boards
+        MainScreen.__init__(self, master, controller, *args, **kwargs)
+
+    def make_board(self):
+        return CanvasBoard(
+            self,
+            screen=self,
+            rows=self.max_tries,
+            cols=self.word_len,
+            boards=self.boards,
+        )
+
+    def start_game(self):
+        answer_deck = self.controller.deck
+        new_game = game.MultiGame(
+            [answer_deck.draw() for _ in range(self.boards)],
+            words.load_all_words(self.word_len, self.controller.wordlist),
+            self.max_tries,
+        )
+        self.controller.events.event(
+            "new_game",
+            answers=new_game.answers,
+            word_len=self.word_len,
+            wordlist=self.controller.wordlist,
+        )
+        # key_boards[digit][letter]: bitset of the boards where the letter got digit
+        self.key_boards = {digit: {} for digit in DIGIT_COLORS}
+        return new_game
+
+    def humiliate(self):
+        missed = [
+            answer
+            for answer, tries in zip(self.game.answers, self.game.solved)
+            if tries is None
+        ]
+        self.game_over_dialog_title.set("Better Luck Next Time!")
+        self.game_over_dialog_message.set(
+            f"One More Game?\n(BTW the words were {', '.join(missed)})"
+        )
+        self.game_over_dialog.place(relx=0.5, rely=0.5, anchor="center")
+
+    def update_keyboard(self):
+        active = 0
+        for b in self.game.active() or range(self.boards):
+            active |= 1 << b
+        correct = self.key_boards[scoring.CORRECT]
+        present = self.key_boards[scoring.PRESENT]
+        absent = self.key_boards[scoring.ABSENT]
+        for key in string.ascii_uppercase:
+            if correct.get(key, 0) & active:
+                color = COLOR_CORRECT
+            elif present.get(key, 0) & active:
+                color = COLOR_HALF_CORRECT
+            elif absent.get(key, 0) & active:
+                color = COLOR_INCORRECT
+            else:
+                color = COLOR_BLANK
+            self.board.set_key(key, color)
+
+    def update_remaining(self):
+        solved = self.boards - len(self.game.active())
+        self.remaining_text.set(f"{solved}/{self.boards} solved")
+
+    def update_labels(self, colors=None):
+        """
+        draw the current row on every board still being played, colors has
+        one list per board, None for boards that weren't scored
+        """
+        word = self.words[self.current_word]
+        for b in range(self.boards):
+            if colors is None and self.game.solved[b] is not None:
+                continue
+            if colors is not None and colors[b] is None:
+                continue
+            for i in range(self.word_len):
+                letter = word[i] if i < len(word) else ""
+                if colors:
+                    bg = border = colors[b][i]
+                else:
+                    bg = COLOR_BLANK
+                    border = COLOR_BORDER_HIGHLIGHT if letter else COLOR_BLANK
+                self.board.set_cell(self.current_word, i, letter, bg, border, board=b)
+
+    def check_word(self, event=None):
+        self.renderer.action("check_word")
+        if self.game.over:
+            return
+
+        word = self.words[self.current_word]
+        try:
+            patterns = self.game.guess(word)
+        except game.InvalidGuess as e:
+            self.controller.events.event("invalid_guess", word=word, reason=str(e))
+            self.toast(str(e))
+            return
+        self.controller.events.event("guess", word=word, patterns=patterns)
+
+        colors = []
+        for b, pattern in enumerate(patterns):
+            if pattern is None:
+                colors.append(None)
+                continue
+            digits = scoring.decode(pattern, self.word_len)
+            colors.append([DIGIT_COLORS[digit] for digit in digits])
+            for x, digit in zip(word, digits):
+                letters = self.key_boards[digit]
+                letters[x] = letters.get(x, 0) | 1 << b
+        self.update_labels(colors)
+        self.update_keyboard()
+        self.update_remaining()
+
+        self.current_word += 1
+        if self.game.over:
+            self.controller.events.event(
+                "game_over", won=self.game.won, tries=len(self.game.history)
+            )
+        if self.game.won:
+            self.congratulate()
+        elif self.game.over:
+            self.humiliate()
+
+    def hint(self):
+        self.toast("No hints with more than one board")
+
+    def share(self, event=None):
+        self.toast("Only single board games can be shared")
+
+
+SCREENS = {
+    "MainScreen": MainScreen,
+    "SettingsScreen": SettingsScreen,
+    "HelpScreen": HelpScreen,
+    "StatsScreen": StatsScreen,
+}
+
+
+def load_state(length, code=None):
+    """the game to continue: the one in a share code, or the one saved on exit"""
+    answers = words.load_answers(length)
+    all_words = words.load_all_words(length)
+    if code:
+        data = snapshot.from_share_code(code)
+    else:
+        data = snapshot.load(snapshot.state_path(length))
+        if data is None:
+            return None
+
+    try:
+        state = snapshot.GameState.unpack(data, answers, all_words)
+        restored = state.to_game(answers, all_words, length + 1)
+    except (ValueError, game.InvalidGuess):
+        if code:
+            raise ValueError("not a valid game code")
+        return None
+    # a finished game has nothing left to play, the board would be stuck
+    if restored.over:
+        if code:
+            raise ValueError("game already finished")
+        return None
+    return state
+
+
+def has_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return False
+    return True
+
+
+def remaining_answers(answers, history):
+    """bitset of the answers still possible after the guesses in history"""
+    return constraints.load_index(answers).candidates(history)
+
+
 class WordleApp(tk.Tk):
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        answer_deck=None,
+        seed=None,
+        daily=False,
+        canvas_ui=False,
+        word_len=WORD_LEN,
+        log_keys=False,
+        hard=False,
+        absurd=False,
+        boards=1,
+        saved_state=None,
+        save_state=False,
+        **kwargs,
+    ):
         tk.Tk.__init__(self, *args, **kwargs)
+        self.word_len = word_len
+        self.boards = boards
+        # the game to continue, and whether to save the game on exit
+        self.saved_state = saved_state if boards == 1 else None
+        self.save_state = save_state and boards == 1
+        self.max_tries = word_len + boards
+        self.wordlist = None
+        # hard mode only applies to single board games
+        self.hard = hard and boards == 1
+        self.absurd = absurd and boards == 1
+        # the deck a wordlist switch opens again, for its own answers
+        self.seed = seed
+        self.daily = daily
+        self.deck = answer_deck or deck.open_deck(
+            words.load_answers(word_len), seed=seed, daily=daily
+        )
+        self.canvas_ui = canvas_ui
+        self.stats = stats.Stats()
+        self.recorder = recordings.Recorder(word_len)
+        # file writes off the ui thread, never cancelled by a new game
+        self.io = tasks.Tasks(self)
+        self.events = events.EventLog(level=logging.DEBUG if log_keys else logging.INFO)
 
         self.title("Wordle - A Word Game")
-        self.state("zoomed")
+        try:
+            self.state("zoomed")
+        except tk.TclError:  # x11 has no zoomed state, only the attribute
+            self.attributes("-zoomed", True)
         # self.resizable(False, False)
-        self.app_icon = tk.PhotoImage(file=APP_ICON)
-        self.iconphoto(False, self.app_icon)
+        # decoded images, shared by every screen
+        self.images = {}
+        self.iconphoto(False, self.image(APP_ICON))
 
         # the container is where we'll stack a bunch of frames
         # on top of each other, then the one we want visible
         # will be raised above the others
-        container = tk.Frame(self, bg=COLOR_BLANK)
-        container.grid(sticky="news")
+        self.container = tk.Frame(self, bg=COLOR_BLANK)
+        self.container.grid(sticky="news")
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
-        container.grid_rowconfigure(0, weight=1)
-        container.grid_columnconfigure(0, weight=1)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
 
+        # screens are built the first time they are shown, so only the
+        # main screen is built before the window first shows up
         self.frames = {}
-        self.frames["MainScreen"] = MainScreen(
-            master=container, controller=self, bg=COLOR_BLANK
-        )
-        self.frames["SettingsScreen"] = SettingsScreen(
-            master=container, controller=self, bg=COLOR_BLANK
-        )
-        self.frames["HelpScreen"] = HelpScreen(
-            master=container, controller=self, bg=COLOR_BLANK
-        )
-
-        # put all of the pages in the same location;
-        # the one on the top of the stacking order
-        # will be the one that is visible.
-        self.frames["MainScreen"].grid(row=0, column=0, sticky="ns")
-        self.frames["SettingsScreen"].grid(row=0, column=0, sticky="news")
-        self.frames["HelpScreen"].grid(row=0, column=0, sticky="news")
-
-        # show the main screen
         self.show_frame("MainScreen")
 
         self.fullscreen = False
         self.bind("<F11>", self.fullscreen_toggle)
 
     def show_frame(self, page_name):
-        """Show a frame for the given page name"""
-        frame = self.frames[page_name]
+        """Show a frame for the given page name, building it on first use"""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            screen = SCREENS[page_name]
+            if page_name == "MainScreen" and self.boards > 1:
+                screen = MultiScreen
+            frame = screen(master=self.container, controller=self, bg=COLOR_BLANK)
+            # put all of the pages in the same location;
+            # the one on the top of the stacking order
+            # will be the one that is visible.
+            sticky = "ns" if page_name == "MainScreen" else "news"
+            frame.grid(row=0, column=0, sticky=sticky)
+            self.frames[page_name] = frame
+        if hasattr(frame, "refresh"):
+            frame.refresh()
         # set the frame focus so that we can capture keyboard events inside this frame
         frame.focus_set()
         # raise the frame to the top of the stack so that it is visible
         frame.tkraise()
 
+    def save_game(self):
+        """save an unfinished game to be continued on the next start"""
+        path = snapshot.state_path(self.word_len)
+        screen = self.frames["MainScreen"]
+        if screen.game.over or self.wordlist is not None or self.absurd:
+            path.unlink(missing_ok=True)
+        else:
+            snapshot.save(path, screen.game_state())
+
+    def image(self, path):
+        """a PhotoImage of path, decoded only the first time it is asked for"""
+        image = self.images.get(path)
+        if image is None:
+            image = self.images[path] = tk.PhotoImage(file=path)
+        return image
+
+    def set_wordlist(self, name):
+        """play from an imported wordlist, or the default one if name is None"""
+        self.wordlist = name
+        answers = words.load_answers(self.word_len, name)
+        self.deck = deck.open_deck(
+            answers, seed=self.seed, daily=self.daily, wordlist=name
+        )
+        self.frames["MainScreen"].new_game()
+
+    def set_hard(self, hard):
+        """
+        switch hard mode, switching it on only takes effect right away if
+        nothing was guessed yet, otherwise from the next game
+        """
+        self.hard = hard
+        current = self.frames["MainScreen"].game
+        if not hard:
+            current.hard = None
+        elif not current.history:
+            current.hard = constraints.HardMode(current.valid_words)
+
+    def set_absurd(self, absurd):
+        """switch absurd mode, which starts a new game"""
+        screen = self.frames["MainScreen"]
+        if absurd and not has_numpy():
+            self.frames["SettingsScreen"].absurd.set(False)
+            screen.toast("Absurdle needs numpy installed")
+            return
+        self.absurd = absurd
+        screen.new_game()
+
+    def destroy(self):
+        if self.save_state and "MainScreen" in self.frames:
+            self.save_game()
+        # let the stats writer finish and stop background work before exiting
+        self.stats.close()
+        self.events.close()
+        self.io.shutdown(wait=True)
+        for frame in self.frames.values():
+            if hasattr(frame, "tasks"):
+                # a running hint has to finish before its solver's pool goes
+                frame.tasks.cancel_all()
+                frame.tasks.shutdown(wait=True)
+            if getattr(frame, "solver", None) is not None:
+                frame.solver.close()
+        tk.Tk.destroy(self)
+
     def fullscreen_toggle(self, event=None):
         """Toggle fullscreen mode"""
         if self.fullscreen:
@@ -457,7 +1608,129 @@ class WordleApp(tk.Tk):
 
 
 if __name__ == "__main__":
-    WordleApp().mainloop()
+    # the worker processes of a frozen exe run this file too
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="A Wordle clone")
+    parser.add_argument(
+        "--seed", type=int, help="play a reproducible sequence of answers"
+    )
+    parser.add_argument(
+        "--daily", action="store_true", help="play the answer of the day"
+    )
+    parser.add_argument(
+        "--canvas",
+        action="store_true",
+        help="draw the board and keyboard on a single canvas",
+    )
+    parser.add_argument(
+        "--length",
+        type=int,
+        default=WORD_LEN,
+        choices=words.available_lengths(),
+        help="number of letters in a word",
+    )
+    parser.add_argument(
+        "--boards",
+        type=int,
+        default=1,
+        choices=BOARD_COUNTS,
+        help="play every guess against this many answers at once",
+    )
+    parser.add_argument(
+        "--hard",
+        action="store_true",
+        help="every guess has to use the hints revealed so far",
+    )
+    parser.add_argument(
+        "--absurd",
+        action="store_true",
+        help="absurdle: no answer is picked, every guess gets the least helpful hints",
+    )
+    parser.add_argument(
+        "--restore", metavar="CODE", help="continue a game from its code (Ctrl+S)"
+    )
+    parser.add_argument(
+        "--log-keys",
+        action="store_true",
+        help="also log every key press to the event log",
+    )
+    report_path, stats_path = profiling.from_env()
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.json",
+        default=report_path,
+        metavar="REPORT",
+        help="write startup and per call timings to REPORT (default: profile.json)",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        default=stats_path,
+        metavar="FILE",
+        help="with --profile, also write cProfile stats to FILE",
+    )
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        profiler = profiling.Profiler(started=STARTED)
+        profiler.mark("import")
+        if args.profile_stats:
+            profiler.start_cprofile()
+        profiler.instrument(words, "load_shard")
+        profiler.instrument(WordleApp, "__init__")
+        for screen in SCREENS.values():
+            profiler.instrument(screen, "__init__")
+        profiler.instrument(
+            MainScreen, "init_ui", "check_word", "enter_letter", "update_labels"
+        )
+        profiler.instrument(MultiScreen, "__init__", "check_word", "update_labels")
+
+    answers = words.load_answers(args.length)
+    answer_deck = deck.open_deck(answers, seed=args.seed, daily=args.daily)
+    # only the regular deck's games are saved and continued
+    save_state = (
+        args.seed is None and not args.daily and args.boards == 1 and not args.absurd
+    )
+    if args.restore and args.boards > 1:
+        parser.error("--restore only works with a single board")
+    if args.hard and args.boards > 1:
+        parser.error("--hard only works with a single board")
+    if args.absurd and (args.boards > 1 or args.restore):
+        parser.error("--absurd only works with a new single board game")
+    if args.absurd and not has_numpy():
+        parser.error("--absurd needs numpy installed")
+    saved_state = None
+    if args.restore or save_state:
+        try:
+            saved_state = load_state(args.length, args.restore)
+        except ValueError as e:
+            parser.error(str(e))
+    app = WordleApp(
+        answer_deck=answer_deck,
+        seed=args.seed,
+        daily=args.daily,
+        canvas_ui=args.canvas,
+        word_len=args.length,
+        log_keys=args.log_keys,
+        hard=args.hard,
+        absurd=args.absurd,
+        boards=args.boards,
+        saved_state=saved_state,
+        save_state=save_state,
+    )
+    if profiler is not None:
+        profiler.mark("app")
+
+        def first_paint():
+            app.update_idletasks()
+            profiler.mark("first_paint")
+
+        app.after_idle(first_paint)
+    app.mainloop()
+
+    if profiler is not None:
+        profiler.save(args.profile, args.profile_stats)
 
 """
 sample error message for when you lose:
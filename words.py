@@ -0,0 +1,344 @@
+"""
+Wordlists and the on-disk locations shared by the game and the headless tools.
+
+The plain text wordlists are compiled into a packed binary format so the game
+does not have to split and upper-case every line at startup:
+
+    header   magic b"PWRD", version (u8), word length (u8), 2 pad bytes,
+             word count (u32 little endian)
+    records  word count fixed-width upper-case ASCII records, sorted
+
+Packed files are mmapped on first use and searched with bisect, nothing is
+copied out of the file until a word is actually looked at.
+
+Wordlists are sharded by word length (wordlists/answers-<n>.bin and
+wordlists/all-words-<n>.bin), only the shards for the length being played
+are opened and only the most recently used ones are kept around. Run this
+module to recompile them after editing the text files:
+
+    python words.py
+"""
+
+from bisect import bisect_left
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+
+import glob
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+try:
+    BASE_PATH = Path(sys._MEIPASS)
+except AttributeError:
+    BASE_PATH = Path(".")
+
+VALID_WORDS_WORDLIST = BASE_PATH / "wordlists/wordle-allowed-guesses.txt"
+ANSWERS_WORDLIST = BASE_PATH / "wordlists/wordle-answers.txt"
+
+DEFAULT_LENGTH = 5
+WORD_LENGTHS = range(4, 9)
+
+# where we keep caches and state that should survive a restart
+DATA_DIR = Path(os.environ.get("PYWORDLE_HOME", Path.home() / ".pywordle"))
+CACHE_DIR = DATA_DIR / "cache"
+# imported wordlists, see ingest.py
+CUSTOM_DIR = DATA_DIR / "wordlists"
+# how many shards stay open, the caches keyed on a shard keep as many
+SHARDS_CACHED = 4
+
+MAGIC = b"PWRD"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2xI")
+
+
+class PackedWordlist(Sequence):
+    """a sorted, read-only wordlist backed by a mmapped packed file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.word_len, self._count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a packed wordlist")
+        size = self.word_len * self._count
+        self.buffer = memoryview(self._mmap)[HEADER.size : HEADER.size + size]
+        self._records = _Records(self.buffer, self.word_len, self._count)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        return self._records[i].decode("ascii")
+
+    def __iter__(self):
+        data = self.buffer.tobytes().decode("ascii")
+        n = self.word_len
+        return (data[i : i + n] for i in range(0, len(data), n))
+
+    def __contains__(self, word):
+        return self.find(word) >= 0
+
+    def find(self, word):
+        """index of word in the list, or -1 if it is not there"""
+        if not isinstance(word, str) or len(word) != self.word_len:
+            return -1
+        try:
+            key = word.encode("ascii")
+        except UnicodeEncodeError:
+            return -1
+        i = bisect_left(self._records, key)
+        if i < self._count and self._records[i] == key:
+            return i
+        return -1
+
+    def index(self, word, *args):
+        i = self.find(word)
+        if i < 0:
+            raise ValueError(f"{word!r} is not in the wordlist")
+        return i
+
+    def array(self):
+        """the records as a (count, word_len) uint8 numpy array, without copying"""
+        import numpy as np
+
+        return np.frombuffer(self.buffer, dtype=np.uint8).reshape(
+            self._count, self.word_len
+        )
+
+
+class _Records(Sequence):
+    """raw byte records of a packed wordlist, what bisect searches over"""
+
+    def __init__(self, buffer, word_len, count):
+        self.buffer = buffer
+        self.word_len = word_len
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        start = i * self.word_len
+        return self.buffer[start : start + self.word_len].tobytes()
+
+
+class LazyWordlist:
+    """stands in for a wordlist and only loads it the first time it is used"""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader(), name)
+
+    def __contains__(self, word):
+        return word in self._loader()
+
+    def __len__(self):
+        return len(self._loader())
+
+    def __iter__(self):
+        return iter(self._loader())
+
+    def __getitem__(self, i):
+        return self._loader()[i]
+
+
+def read_wordlist(path):
+    """read a wordlist file and return its words upper-cased and sorted"""
+    with open(path) as f:
+        return sorted({line.strip().upper() for line in f if line.strip()})
+
+
+def write_packed(path, words):
+    """
+    write already sorted and de-duplicated words as a packed file, words can
+    be any iterable so a wordlist can be streamed to disk
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    word_len = count = 0
+    with open(tmp, "wb") as f:
+        # the header is rewritten once we know how many words there are
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        for word in words:
+            word_len = len(word)
+            f.write(word.encode("ascii"))
+            count += 1
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, word_len, count))
+    os.replace(tmp, path)
+    return count
+
+
+def compile_wordlist(packed, *sources):
+    """merge the text wordlists into a single packed file"""
+    merged = set()
+    for source in sources:
+        merged.update(read_wordlist(source))
+    write_packed(packed, sorted(merged))
+
+
+def open_packed(packed, *sources):
+    """open a packed wordlist, recompiling it first if a source is newer"""
+    sources = [source for source in sources if source.exists()]
+    if sources and (
+        not packed.exists()
+        or max(source.stat().st_mtime for source in sources) > packed.stat().st_mtime
+    ):
+        try:
+            compile_wordlist(packed, *sources)
+        except OSError:
+            # read-only install, keep a copy in the cache instead
+            packed = CACHE_DIR / f"{packed.stem}-{wordlists_hash(*sources)[:16]}.bin"
+            if not packed.exists():
+                compile_wordlist(packed, *sources)
+    return PackedWordlist(packed)
+
+
+def shard_path(kind, length):
+    """packed file of a shard, kind is either answers or all-words"""
+    return BASE_PATH / f"wordlists/{kind}-{length}.bin"
+
+
+def shard_sources(kind, length):
+    """the text wordlists a shard is compiled from"""
+    if length == DEFAULT_LENGTH:
+        answers = ANSWERS_WORDLIST
+        allowed = VALID_WORDS_WORDLIST
+    else:
+        answers = BASE_PATH / f"wordlists/answers-{length}.txt"
+        allowed = BASE_PATH / f"wordlists/allowed-guesses-{length}.txt"
+    return [answers] if kind == "answers" else [allowed, answers]
+
+
+def available_lengths():
+    """word lengths we have an answers shard for"""
+    return [
+        length
+        for length in WORD_LENGTHS
+        if shard_path("answers", length).exists()
+        or any(source.exists() for source in shard_sources("answers", length))
+    ]
+
+
+def custom_path(name, length):
+    """packed file of the latest import of one length of a wordlist"""
+    versions = _custom_versions(name, length)
+    if versions:
+        return max(versions, key=lambda path: path.stat().st_mtime_ns)
+    return CUSTOM_DIR / f"{name}-{length}.bin"
+
+
+def write_custom(name, length, words):
+    """
+    write one length of an imported wordlist and return its word count.
+    every import is a new file named after its checksum, so a list that is
+    open (and mmapped) is never replaced under the game's feet, older
+    versions are removed once nothing has them open
+    """
+    CUSTOM_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = CUSTOM_DIR / f"{name}-{length}.{os.getpid()}.tmp"
+    count = write_packed(tmp, words)
+    with open(tmp, "rb") as f:
+        checksum = zlib.crc32(f.read())
+    path = CUSTOM_DIR / f"{name}-{length}-{checksum:08x}.bin"
+    if path.exists():
+        # the same words as a version we have, make it the latest again
+        os.utime(path)
+        tmp.unlink()
+    else:
+        os.replace(tmp, path)
+
+    for old in _custom_versions(name, length) + [CUSTOM_DIR / f"{name}-{length}.bin"]:
+        if old != path:
+            try:
+                old.unlink(missing_ok=True)
+            except OSError:
+                # still mapped on windows, the next import tries again
+                pass
+    return count
+
+
+def _custom_versions(name, length):
+    return list(CUSTOM_DIR.glob(f"{glob.escape(name)}-{length}-*.bin"))
+
+
+def custom_wordlists():
+    """names of the imported wordlists and the word lengths each one has"""
+    found = {}
+    for path in CUSTOM_DIR.glob("*-*.bin"):
+        parts = path.stem.rsplit("-", 2)
+        if len(parts) == 3 and parts[1].isdigit():
+            name, length = parts[0], parts[1]
+        else:
+            # imported before the files were versioned
+            name, _, length = path.stem.rpartition("-")
+        if length.isdigit():
+            found.setdefault(name, set()).add(int(length))
+    return {name: sorted(lengths) for name, lengths in sorted(found.items())}
+
+
+@lru_cache(maxsize=SHARDS_CACHED)
+def load_shard(kind, length, path=None):
+    """
+    open a shard, keeping the answers and all-words of two lengths around.
+    kind "custom" opens the imported wordlist file at path instead.
+    """
+    if kind == "custom":
+        return PackedWordlist(path)
+    return open_packed(shard_path(kind, length), *shard_sources(kind, length))
+
+
+def load_answers(length=DEFAULT_LENGTH, wordlist=None):
+    """
+    sorted list of the words that can be picked as answers, an imported
+    wordlist is used for both answers and guesses
+    """
+    if wordlist is not None:
+        return load_shard("custom", length, custom_path(wordlist, length))
+    return load_shard("answers", length)
+
+
+def load_all_words(length=DEFAULT_LENGTH, wordlist=None):
+    """sorted list of every word that is accepted as a guess"""
+    if wordlist is not None:
+        return load_shard("custom", length, custom_path(wordlist, length))
+    return load_shard("all-words", length)
+
+
+ANSWERS = LazyWordlist(load_answers)
+ALL_WORDS = LazyWordlist(load_all_words)
+
+
+def wordlists_hash(*paths):
+    """hash the contents of the given wordlist files, used to key caches"""
+    import hashlib
+
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+if __name__ == "__main__":
+    for length in available_lengths():
+        for kind in ("answers", "all-words"):
+            path = shard_path(kind, length)
+            sources = [s for s in shard_sources(kind, length) if s.exists()]
+            compile_wordlist(path, *sources)
+            print(f"{path}: {len(PackedWordlist(path))} words")